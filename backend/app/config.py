@@ -14,6 +14,54 @@ class Settings(BaseSettings):
     # Resend Email
     RESEND_API_KEY: Optional[str] = None
 
+    # Inbox
+    CONVERSATION_REUSE_WINDOW_HOURS: int = 72
+    MESSAGE_ARCHIVE_AFTER_DAYS: int = 180
+    MESSAGE_ARCHIVE_BATCH: int = 500
+    MESSAGE_PARTITIONS_AHEAD: int = 3
+    MESSAGE_MAINTENANCE_INTERVAL_HOURS: int = 6
+
+    # Public booking
+    AVAILABILITY_MAX_RANGE_DAYS: int = 42
+    AVAILABILITY_CACHE_SIZE: int = 20000
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 60
+    AVAILABILITY_SNAPSHOT_DIR: Optional[str] = None
+    AVAILABILITY_SNAPSHOT_DAYS: int = 60
+
+    # Bookings
+    BOOKINGS_PAGE_SIZE: int = 100
+    BOOKINGS_MAX_PAGE_SIZE: int = 500
+    CALENDAR_MAX_RANGE_DAYS: int = 62
+    BOOKING_SERIES_MAX_OCCURRENCES: int = 52
+    CALENDAR_FEED_PAST_DAYS: int = 30
+    CALENDAR_FEED_FUTURE_DAYS: int = 365
+
+    # Forms
+    FORM_SUBMISSIONS_PAGE_SIZE: int = 100
+    FORM_SUBMISSIONS_MAX_PAGE_SIZE: int = 500
+    FORM_SCHEMA_CACHE_SIZE: int = 2000
+
+    # Idempotency-Key support on public POSTs
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_CLEANUP_INTERVAL_MINUTES: int = 60
+
+    # Waitlist
+    WAITLIST_HOLD_MINUTES: int = 15
+    WAITLIST_MATCH_BATCH_SIZE: int = 100
+    WAITLIST_MATCH_INTERVAL_MS: int = 500
+    WAITLIST_MATCH_CANDIDATES: int = 200
+    WAITLIST_EXPIRY_INTERVAL_SECONDS: int = 60
+
+    # Provider webhooks
+    WEBHOOK_SECRET: Optional[str] = None
+    WEBHOOK_ALLOW_UNAUTHENTICATED: bool = False  # local development only
+    INBOUND_BATCH_SIZE: int = 200
+    INBOUND_FLUSH_INTERVAL_MS: int = 250
+    STATUS_BATCH_SIZE: int = 1000
+    STATUS_FLUSH_INTERVAL_MS: int = 1000
+    INTEGRATION_HEALTH_MIN_EVENTS: int = 50
+    INTEGRATION_FAILURE_RATE_THRESHOLD: float = 0.2
+
     # URLs
     FRONTEND_URL: str = "http://localhost:3000"
     BACKEND_URL: str = "http://localhost:8000"
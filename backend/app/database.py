@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
+from datetime import date
 from app.config import settings
 import ssl
 
@@ -56,4 +58,134 @@ async def get_db():
 
 async def create_tables():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+    await add_missing_columns()
+    await migrate_form_template_links()
+    await ensure_message_partitions()
+
+
+# Columns added to tables that already existed. create_all only creates missing
+# tables, so databases from before each change get the column here:
+# (table, column, statements run when it is missing)
+ADDED_COLUMNS = [
+    ("services", "capacity", [
+        "ALTER TABLE services ADD COLUMN IF NOT EXISTS capacity INTEGER NOT NULL DEFAULT 1",
+    ]),
+    ("bookings", "series_id", [
+        "ALTER TABLE bookings ADD COLUMN IF NOT EXISTS series_id UUID REFERENCES booking_series (id)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_series ON bookings (series_id)",
+    ]),
+    ("conversations", "archived_at", [
+        "ALTER TABLE conversations ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP",
+    ]),
+]
+
+
+async def add_missing_columns():
+    """Add ADDED_COLUMNS that an older database lacks.
+
+    Checked against information_schema first, so a database that is already
+    current never takes the ALTER TABLE lock on startup.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtextextended('added_columns', 0))"))
+        existing = set((await conn.execute(text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema()"
+        ))).all())
+        for table, column, statements in ADDED_COLUMNS:
+            if (table, column) in existing:
+                continue
+            for statement in statements:
+                await conn.execute(text(statement))
+            print(f"✅ Added column {table}.{column}")
+
+
+async def migrate_form_template_links():
+    """Copy the old form_templates.linked_service_ids JSON lists into
+    form_template_services on databases created before the association table.
+
+    Runs once: adding applies_to_all_services marks the migration as done. The
+    JSON column is left in place (unused) so older releases can still run.
+    """
+    async with engine.begin() as conn:
+        # Workers starting together take turns; later ones find the flag present
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtextextended('form_template_links', 0))"))
+        migrated = await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'form_templates' AND column_name = 'applies_to_all_services')"
+        ))
+        if migrated:
+            return
+
+        await conn.execute(text(
+            "ALTER TABLE form_templates ADD COLUMN applies_to_all_services boolean NOT NULL DEFAULT true"
+        ))
+        # A non-empty list keeps limiting the template even if its services are
+        # gone, so it applies to nothing rather than becoming global
+        await conn.execute(text(
+            "UPDATE form_templates SET applies_to_all_services = false "
+            "WHERE jsonb_typeof(linked_service_ids::jsonb) = 'array' "
+            "AND jsonb_array_length(linked_service_ids::jsonb) > 0"
+        ))
+
+        # Ids that are not services any more are dropped; the FK would reject them
+        result = await conn.execute(text(
+            "INSERT INTO form_template_services (form_template_id, service_id) "
+            "SELECT DISTINCT t.id, s.id FROM form_templates t "
+            "CROSS JOIN LATERAL jsonb_array_elements_text("
+            "  CASE WHEN jsonb_typeof(t.linked_service_ids::jsonb) = 'array' "
+            "  THEN t.linked_service_ids::jsonb ELSE '[]'::jsonb END"
+            ") AS linked(service_id) "
+            "JOIN services s ON s.id::text = lower(linked.service_id) "
+            "ON CONFLICT DO NOTHING"
+        ))
+        print(f"✅ Migrated {result.rowcount} form template service link(s)")
+
+
+def _month_start(d: date, offset: int) -> date:
+    month = d.month - 1 + offset
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+async def ensure_message_partitions(months_ahead: int = None) -> bool:
+    """Create monthly partitions of messages up to months_ahead in the future.
+
+    Returns False when messages is the unpartitioned table of a database created
+    before partitioning. Live messages keep working there, but partition
+    maintenance and archiving are off until the table is rebuilt as
+    RANGE (created_at) partitions; nothing here converts it.
+    """
+    if months_ahead is None:
+        months_ahead = settings.MESSAGE_PARTITIONS_AHEAD
+
+    async with engine.begin() as conn:
+        partitioned = await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('messages'))"
+        ))
+        if not partitioned:
+            print(
+                "❌ messages table is not partitioned: partition maintenance and message archiving "
+                "are disabled until it is rebuilt partitioned by RANGE (created_at)"
+            )
+            return False
+
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS messages_default PARTITION OF messages DEFAULT"
+        ))
+
+    today = date.today()
+    for offset in range(-1, months_ahead + 1):
+        start = _month_start(today, offset)
+        end = _month_start(today, offset + 1)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS messages_{start:%Y_%m} PARTITION OF messages "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+        except Exception as e:
+            # Fails if rows for this month already landed in the default partition
+            print(f"❌ Could not create partition messages_{start:%Y_%m}: {e}")
+    return True
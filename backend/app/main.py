@@ -1,15 +1,33 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.config import settings
 from app.database import create_tables
+from app.services.services import availability_cache_stats, form_schemas, run_idempotency_cleanup
+from app.services.messaging_service import inbound_writer, status_writer, run_message_maintenance
+from app.services.waitlist_service import waitlist_matcher, run_waitlist_expiry
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_tables()
     print("✅ Database tables created")
+    if not settings.WEBHOOK_SECRET:
+        if settings.WEBHOOK_ALLOW_UNAUTHENTICATED:
+            print("⚠️ WEBHOOK_SECRET is not set: /api/webhooks accepts unauthenticated requests")
+        else:
+            print("⚠️ WEBHOOK_SECRET is not set: /api/webhooks will reject every request")
+    maintenance = asyncio.create_task(run_message_maintenance())
+    waitlist_expiry = asyncio.create_task(run_waitlist_expiry())
+    idempotency_cleanup = asyncio.create_task(run_idempotency_cleanup())
     yield
+    maintenance.cancel()
+    waitlist_expiry.cancel()
+    idempotency_cleanup.cancel()
+    await inbound_writer.close()
+    await status_writer.close()
+    await waitlist_matcher.close()
     print("👋 Shutting down")
 
 
@@ -38,7 +56,12 @@ async def health_check():
     return {"status": "healthy", "service": "careops-api"}
 
 
-from app.routers import auth, workspace, operations, forms, inventory, dashboard, public
+@app.get("/health/cache")
+async def cache_stats():
+    return {"availability": availability_cache_stats(), "form_schemas": form_schemas.stats()}
+
+
+from app.routers import auth, workspace, operations, forms, inventory, dashboard, public, webhooks, calendar
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(workspace.router, prefix="/api/workspace", tags=["Workspace"])
@@ -46,4 +69,6 @@ app.include_router(operations.router, prefix="/api", tags=["Operations"])
 app.include_router(forms.router, prefix="/api/forms", tags=["Forms"])
 app.include_router(inventory.router, prefix="/api", tags=["Inventory"])
 app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
-app.include_router(public.router, prefix="/api/public", tags=["Public"])
\ No newline at end of file
+app.include_router(public.router, prefix="/api/public", tags=["Public"])
+app.include_router(webhooks.router, prefix="/api/webhooks", tags=["Webhooks"])
+app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
\ No newline at end of file
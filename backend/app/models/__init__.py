@@ -2,16 +2,19 @@ from app.models.user import User
 from app.models.workspace import Workspace
 from app.models.contact import Contact
 from app.models.conversation import Conversation
-from app.models.message import Message
+from app.models.message import Message, ArchivedMessage
 from app.models.service import Service
-from app.models.availability import AvailabilitySlot
-from app.models.booking import Booking
-from app.models.form_template import FormTemplate
+from app.models.availability import AvailabilitySlot, AvailabilityOverride
+from app.models.booking import Booking, BookingSeries
+from app.models.form_template import FormTemplate, FormTemplateService
 from app.models.form_submission import FormSubmission
 from app.models.inventory import InventoryItem
 from app.models.integration import Integration
 from app.models.automation_log import AutomationLog
 from app.models.alert import Alert
+from app.models.calendar_feed import CalendarFeed
+from app.models.waitlist import WaitlistEntry
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "User",
@@ -19,13 +22,20 @@ __all__ = [
     "Contact",
     "Conversation",
     "Message",
+    "ArchivedMessage",
     "Service",
     "AvailabilitySlot",
+    "AvailabilityOverride",
     "Booking",
+    "BookingSeries",
     "FormTemplate",
+    "FormTemplateService",
     "FormSubmission",
     "InventoryItem",
     "Integration",
     "AutomationLog",
     "Alert",
+    "CalendarFeed",
+    "WaitlistEntry",
+    "IdempotencyKey",
 ]
\ No newline at end of file
@@ -1,9 +1,10 @@
 import uuid
-from sqlalchemy import Integer, Time, Boolean, ForeignKey
+from sqlalchemy import Integer, String, Time, Date, DateTime, Boolean, ForeignKey, Index, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
-from datetime import time
+from datetime import time, date, datetime
+import enum
 
 
 class AvailabilitySlot(Base):
@@ -23,4 +24,41 @@ class AvailabilitySlot(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Relationships
-    service = relationship("Service", back_populates="availability_slots")
\ No newline at end of file
+    service = relationship("Service", back_populates="availability_slots")
+
+
+class OverrideKind(str, enum.Enum):
+    CLOSED = "closed"
+    CUSTOM_HOURS = "custom_hours"
+    EXTRA_WINDOW = "extra_window"
+
+
+class AvailabilityOverride(Base):
+    """Date-specific exception to the weekly AvailabilitySlot template"""
+
+    __tablename__ = "availability_overrides"
+    __table_args__ = (
+        Index("ix_availability_overrides_service_dates", "service_id", "start_date", "end_date"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    service_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("services.id", ondelete="CASCADE"), nullable=False
+    )
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)  # inclusive
+    kind: Mapped[str] = mapped_column(
+        SAEnum(OverrideKind, name="override_kind", create_constraint=True),
+        nullable=False,
+    )
+    start_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    end_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    # Relationships
+    service = relationship("Service", back_populates="availability_overrides")
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date, time
-from sqlalchemy import String, DateTime, ForeignKey, Text, Date, Time, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Text, Date, Time, Integer, Index, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
@@ -17,6 +17,11 @@ class BookingStatus(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_service_date", "service_id", "booking_date"),
+        Index("ix_bookings_workspace_date_start_id", "workspace_id", "booking_date", "start_time", "id"),
+        Index("ix_bookings_series", "series_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -30,6 +35,9 @@ class Booking(Base):
     contact_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False
     )
+    series_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("booking_series.id"), nullable=True
+    )
     booking_date: Mapped[date] = mapped_column(Date, nullable=False)
     start_time: Mapped[time] = mapped_column(Time, nullable=False)
     end_time: Mapped[time] = mapped_column(Time, nullable=False)
@@ -53,4 +61,35 @@ class Booking(Base):
     workspace = relationship("Workspace", back_populates="bookings")
     service = relationship("Service", back_populates="bookings")
     contact = relationship("Contact", back_populates="bookings")
-    form_submissions = relationship("FormSubmission", back_populates="booking")
\ No newline at end of file
+    form_submissions = relationship("FormSubmission", back_populates="booking")
+    series = relationship("BookingSeries", back_populates="bookings")
+
+
+class BookingSeries(Base):
+    """A recurring appointment: every interval_weeks weeks from first_date"""
+
+    __tablename__ = "booking_series"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False
+    )
+    service_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("services.id"), nullable=False
+    )
+    contact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False
+    )
+    first_date: Mapped[date] = mapped_column(Date, nullable=False)
+    start_time: Mapped[time] = mapped_column(Time, nullable=False)
+    interval_weeks: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False)
+    until: Mapped[date | None] = mapped_column(Date, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    # Relationships
+    bookings = relationship("Booking", back_populates="series")
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Text, Index, func, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
@@ -11,6 +11,7 @@ class ContactSource(str, enum.Enum):
     CONTACT_FORM = "contact_form"
     BOOKING = "booking"
     MANUAL = "manual"
+    INBOUND = "inbound"
 
 
 class Contact(Base):
@@ -42,4 +43,14 @@ class Contact(Base):
     workspace = relationship("Workspace", back_populates="contacts")
     conversations = relationship("Conversation", back_populates="contact")
     bookings = relationship("Booking", back_populates="contact")
-    form_submissions = relationship("FormSubmission", back_populates="contact")
\ No newline at end of file
+    form_submissions = relationship("FormSubmission", back_populates="contact")
+
+
+# Lookup indexes for resolving a contact from an email address or phone number.
+# Expressions must match normalize_email / normalize_phone in app.utils.helpers.
+Index("ix_contacts_workspace_email_norm", Contact.workspace_id, func.lower(Contact.email))
+Index(
+    "ix_contacts_workspace_phone_norm",
+    Contact.workspace_id,
+    func.regexp_replace(Contact.phone, "[^0-9+]", "", "g"),
+)
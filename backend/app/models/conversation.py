@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Boolean, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Boolean, Index, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
@@ -14,6 +14,9 @@ class ConversationStatus(str, enum.Enum):
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_workspace_contact_status", "workspace_id", "contact_id", "status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -37,6 +40,9 @@ class Conversation(Base):
     last_message_at: Mapped[datetime | None] = mapped_column(
         DateTime, nullable=True
     )
+    archived_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )  # set once messages have moved to messages_archive
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
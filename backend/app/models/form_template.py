@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
@@ -20,12 +20,12 @@ class FormTemplate(Base):
     fields: Mapped[dict] = mapped_column(
         JSON, nullable=False, default=list
     )  # [{name, type, required, options}]
-    linked_service_ids: Mapped[dict | None] = mapped_column(
-        JSON, nullable=True, default=list
-    )  # [service_uuid, ...]
     deadline_hours: Mapped[int | None] = mapped_column(
         nullable=True, default=24
     )  # hours before appointment
+    applies_to_all_services: Mapped[bool] = mapped_column(
+        Boolean, default=True, server_default="true", nullable=False
+    )  # otherwise only the services in service_links
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -36,4 +36,30 @@ class FormTemplate(Base):
 
     # Relationships
     workspace = relationship("Workspace", back_populates="form_templates")
-    submissions = relationship("FormSubmission", back_populates="form_template")
\ No newline at end of file
+    submissions = relationship("FormSubmission", back_populates="form_template")
+    service_links = relationship(
+        "FormTemplateService", back_populates="form_template", cascade="all, delete-orphan", lazy="selectin"
+    )
+
+    @property
+    def linked_service_ids(self) -> list[str]:
+        """Services the template is linked to (ignored when applies_to_all_services)"""
+        return [str(link.service_id) for link in self.service_links]
+
+
+class FormTemplateService(Base):
+    __tablename__ = "form_template_services"
+    __table_args__ = (
+        Index("ix_form_template_services_service", "service_id"),
+    )
+
+    form_template_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("form_templates.id", ondelete="CASCADE"), primary_key=True
+    )
+    service_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("services.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Relationships
+    form_template = relationship("FormTemplate", back_populates="service_links")
+    service = relationship("Service", back_populates="form_template_links")
\ No newline at end of file
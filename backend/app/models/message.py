@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Text, Index, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
@@ -31,8 +31,8 @@ class MessageStatus(str, enum.Enum):
     PENDING = "pending"
 
 
-class Message(Base):
-    __tablename__ = "messages"
+class MessageColumns:
+    """Columns shared by the live (partitioned) and archived message tables"""
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -63,9 +63,37 @@ class Message(Base):
         default=MessageStatus.PENDING,
         nullable=False,
     )
+
+
+class Message(MessageColumns, Base):
+    __tablename__ = "messages"
+    # Range-partitioned by month; partitions are created by
+    # app.database.ensure_message_partitions. The partition key has to be
+    # part of the primary key.
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False
     )
 
     # Relationships
-    conversation = relationship("Conversation", back_populates="messages")
\ No newline at end of file
+    conversation = relationship("Conversation", back_populates="messages")
+
+
+class ArchivedMessage(MessageColumns, Base):
+    """Messages of closed conversations past the retention horizon"""
+
+    __tablename__ = "messages_archive"
+    __table_args__ = (
+        Index("ix_messages_archive_conversation_created", "conversation_id", "created_at"),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
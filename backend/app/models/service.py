@@ -33,6 +33,7 @@ class Service(Base):
     )
     address: Mapped[str | None] = mapped_column(Text, nullable=True)
     buffer_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    capacity: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # seats per slot
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -44,4 +45,6 @@ class Service(Base):
     # Relationships
     workspace = relationship("Workspace", back_populates="services")
     availability_slots = relationship("AvailabilitySlot", back_populates="service", cascade="all, delete-orphan")
-    bookings = relationship("Booking", back_populates="service")
\ No newline at end of file
+    availability_overrides = relationship("AvailabilityOverride", back_populates="service", cascade="all, delete-orphan")
+    bookings = relationship("Booking", back_populates="service")
+    form_template_links = relationship("FormTemplateService", back_populates="service", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
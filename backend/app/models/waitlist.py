@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime, date, time
+from sqlalchemy import String, DateTime, ForeignKey, Date, Time, Index, Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+import enum
+
+
+class WaitlistStatus(str, enum.Enum):
+    WAITING = "waiting"
+    OFFERED = "offered"
+    BOOKED = "booked"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+
+class WaitlistEntry(Base):
+    """A contact waiting for any slot of a service between date_from and date_to"""
+
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        # Matching: waiting entries for a service whose window covers a date, oldest first
+        Index("ix_waitlist_match", "service_id", "status", "date_from", "date_to", "created_at"),
+        Index("ix_waitlist_offer_expiry", "status", "offer_expires_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False
+    )
+    service_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("services.id", ondelete="CASCADE"), nullable=False
+    )
+    contact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False
+    )
+    date_from: Mapped[date] = mapped_column(Date, nullable=False)
+    date_to: Mapped[date] = mapped_column(Date, nullable=False)
+    earliest_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    latest_time: Mapped[time | None] = mapped_column(Time, nullable=True)  # latest end time
+    status: Mapped[str] = mapped_column(
+        SAEnum(WaitlistStatus, name="waitlist_status", create_constraint=True),
+        default=WaitlistStatus.WAITING,
+        nullable=False,
+    )
+    booking_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("bookings.id"), nullable=True
+    )  # held booking while offered
+    offer_token: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True)
+    offer_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    # Relationships
+    contact = relationship("Contact")
+    service = relationship("Service")
+    booking = relationship("Booking")
\ No newline at end of file
@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models.user import User
+from app.schemas import CalendarFeedCreate, CalendarFeedResponse, CalendarFeedListResponse
+from app.services.services import (
+    get_service,
+    create_calendar_feed, get_calendar_feeds, delete_calendar_feed, get_calendar_feed_by_token,
+    calendar_feed_window, calendar_feed_etag, stream_calendar_feed,
+)
+from app.utils.deps import get_current_user, get_current_owner
+from typing import Optional
+import uuid
+
+router = APIRouter()
+
+
+# ============================================================
+# FEED MANAGEMENT
+# ============================================================
+
+@router.get("/feeds", response_model=CalendarFeedListResponse)
+async def list_feeds(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="No workspace found")
+
+    feeds = await get_calendar_feeds(db, current_user.workspace_id)
+    return CalendarFeedListResponse(
+        feeds=[CalendarFeedResponse.model_validate(f) for f in feeds],
+        total=len(feeds),
+    )
+
+
+@router.post("/feeds", response_model=CalendarFeedResponse)
+async def create_feed(
+    data: CalendarFeedCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_owner),
+):
+    if not current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="No workspace found")
+
+    if data.service_id:
+        service = await get_service(db, data.service_id)
+        if not service or service.workspace_id != current_user.workspace_id:
+            raise HTTPException(status_code=404, detail="Service not found")
+
+    feed = await create_calendar_feed(db, current_user.workspace_id, data.name, data.service_id)
+    return CalendarFeedResponse.model_validate(feed)
+
+
+@router.delete("/feeds/{feed_id}")
+async def delete_feed(
+    feed_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_owner),
+):
+    if not current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="No workspace found")
+
+    try:
+        feed_uuid = uuid.UUID(feed_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    deleted = await delete_calendar_feed(db, current_user.workspace_id, feed_uuid)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return {"message": "Feed deleted"}
+
+
+# ============================================================
+# ICS FEED (token-authenticated, polled by calendar clients)
+# ============================================================
+
+@router.get("/{token}.ics")
+async def calendar_feed(
+    token: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    found = await get_calendar_feed_by_token(db, token)
+    if not found:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    feed, workspace = found
+
+    date_from, date_to = calendar_feed_window()
+    etag = await calendar_feed_etag(db, feed, workspace, date_from, date_to)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    # Common poll: nothing changed, nothing serialized
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    return StreamingResponse(
+        stream_calendar_feed(feed, workspace, date_from, date_to),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User
@@ -10,6 +10,8 @@ from app.services.services import (
     create_form_template, get_form_templates, get_form_submissions,
 )
 from app.utils.deps import get_current_user, get_current_owner
+from typing import Optional
+from datetime import date
 import uuid
 
 router = APIRouter()
@@ -24,9 +26,12 @@ async def create_template(
     if not current_user.workspace_id:
         raise HTTPException(status_code=404, detail="No workspace found")
 
-    template = await create_form_template(
-        db, current_user.workspace_id, data.model_dump()
-    )
+    try:
+        template = await create_form_template(
+            db, current_user.workspace_id, data.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return FormTemplateResponse.model_validate(template)
 
 
@@ -47,14 +52,34 @@ async def list_templates(
 
 @router.get("/submissions", response_model=FormSubmissionListResponse)
 async def list_submissions(
+    status: Optional[str] = None,
+    template_id: Optional[str] = None,
+    booking_id: Optional[str] = None,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     if not current_user.workspace_id:
         raise HTTPException(status_code=404, detail="No workspace found")
 
-    submissions = await get_form_submissions(db, current_user.workspace_id)
+    try:
+        submissions, next_cursor = await get_form_submissions(
+            db, current_user.workspace_id, status,
+            form_template_id=uuid.UUID(template_id) if template_id else None,
+            booking_id=uuid.UUID(booking_id) if booking_id else None,
+            date_from=date.fromisoformat(date_from) if date_from else None,
+            date_to=date.fromisoformat(date_to) if date_to else None,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return FormSubmissionListResponse(
         submissions=[FormSubmissionResponse(**s) for s in submissions],
         total=len(submissions),
+        next_cursor=next_cursor,
     )
\ No newline at end of file
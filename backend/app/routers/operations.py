@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.schemas import (
@@ -8,13 +9,16 @@ from app.schemas import (
     MessageCreate, MessageResponse,
     ServiceCreate, ServiceUpdate, ServiceResponse, ServiceListResponse,
     AvailabilitySlotCreate, AvailabilitySlotResponse,
-    BookingResponse, BookingListResponse, BookingStatusUpdate,
+    AvailabilityOverrideCreate, AvailabilityOverrideResponse, AvailabilityOverrideListResponse,
+    BookingResponse, BookingListResponse, BookingStatusUpdate, BookingCalendarResponse,
+    BookingStatusBatchUpdate, BookingStatusBatchResponse,
 )
 from app.services.services import (
     create_contact, get_contacts, get_contact,
     get_conversations, get_conversation_detail, send_message,
     create_service, get_services, get_service, update_service, delete_service,
-    get_bookings, get_booking, update_booking_status,
+    create_availability_override, get_availability_overrides, delete_availability_override,
+    get_bookings, get_booking, get_booking_calendar, update_booking_status, update_booking_statuses,
 )
 from app.utils.deps import get_current_user, get_current_owner
 from datetime import date
@@ -191,6 +195,65 @@ async def delete_service_endpoint(
     return {"message": "Service deleted"}
 
 
+async def _workspace_service(db: AsyncSession, service_id: str, user: User):
+    """The service if it belongs to the user's workspace, else 404"""
+    try:
+        service = await get_service(db, uuid.UUID(service_id))
+    except ValueError:
+        service = None
+    if not service or not user.workspace_id or service.workspace_id != user.workspace_id:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return service
+
+
+@router.post("/services/{service_id}/overrides", response_model=AvailabilityOverrideResponse)
+async def create_override_endpoint(
+    service_id: str,
+    data: AvailabilityOverrideCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_owner),
+):
+    service = await _workspace_service(db, service_id, current_user)
+
+    try:
+        override = await create_availability_override(db, service.id, data.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AvailabilityOverrideResponse.model_validate(override)
+
+
+@router.get("/services/{service_id}/overrides", response_model=AvailabilityOverrideListResponse)
+async def list_overrides(
+    service_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    service = await _workspace_service(db, service_id, current_user)
+    overrides = await get_availability_overrides(db, service.id)
+    return AvailabilityOverrideListResponse(
+        overrides=[AvailabilityOverrideResponse.model_validate(o) for o in overrides],
+        total=len(overrides),
+    )
+
+
+@router.delete("/services/{service_id}/overrides/{override_id}")
+async def delete_override_endpoint(
+    service_id: str,
+    override_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_owner),
+):
+    service = await _workspace_service(db, service_id, current_user)
+    try:
+        override_uuid = uuid.UUID(override_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Override not found")
+    deleted = await delete_availability_override(db, service.id, override_uuid)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Override not found")
+    return {"message": "Override deleted"}
+
+
 # ============================================================
 # BOOKINGS
 # ============================================================
@@ -199,6 +262,12 @@ async def delete_service_endpoint(
 async def list_bookings(
     status: Optional[str] = None,
     date: Optional[str] = None,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    service_id: Optional[str] = None,
+    contact_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -206,17 +275,61 @@ async def list_bookings(
         raise HTTPException(status_code=404, detail="No workspace found")
 
     from datetime import date as date_type
-    date_filter = None
-    if date:
-        date_filter = date_type.fromisoformat(date)
+    try:
+        date_filter = date_type.fromisoformat(date) if date else None
+        range_from = date_type.fromisoformat(date_from) if date_from else None
+        range_to = date_type.fromisoformat(date_to) if date_to else None
+        bookings, next_cursor = await get_bookings(
+            db, current_user.workspace_id, status, date_filter,
+            date_from=range_from,
+            date_to=range_to,
+            service_id=uuid.UUID(service_id) if service_id else None,
+            contact_id=uuid.UUID(contact_id) if contact_id else None,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    bookings = await get_bookings(db, current_user.workspace_id, status, date_filter)
     return BookingListResponse(
         bookings=[BookingResponse(**b) for b in bookings],
         total=len(bookings),
+        next_cursor=next_cursor,
     )
 
 
+@router.get("/bookings/calendar", response_model=BookingCalendarResponse)
+async def booking_calendar(
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to"),
+    granularity: str = "day",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="No workspace found")
+
+    try:
+        start = date.fromisoformat(date_from)
+        end = date.fromisoformat(date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end - start).days + 1 > settings.CALENDAR_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is limited to {settings.CALENDAR_MAX_RANGE_DAYS} days",
+        )
+
+    try:
+        buckets = await get_booking_calendar(db, current_user.workspace_id, start, end, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BookingCalendarResponse(date_from=start, date_to=end, granularity=granularity, buckets=buckets)
+
+
 @router.get("/bookings/{booking_id}", response_model=BookingResponse)
 async def get_booking_detail(
     booking_id: str,
@@ -241,4 +354,23 @@ async def update_booking(
         raise HTTPException(status_code=404, detail="Booking not found")
 
     booking_data = await get_booking(db, uuid.UUID(booking_id))
-    return BookingResponse(**booking_data)
\ No newline at end of file
+    return BookingResponse(**booking_data)
+
+
+@router.post("/bookings/status:batch", response_model=BookingStatusBatchResponse)
+async def update_bookings_batch(
+    data: BookingStatusBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="No workspace found")
+
+    try:
+        updated, not_found = await update_booking_statuses(
+            db, current_user.workspace_id, [u.model_dump() for u in data.updates]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BookingStatusBatchResponse(updated=len(updated), booking_ids=updated, not_found=not_found)
\ No newline at end of file
@@ -1,27 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Header
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import (
     PublicContactSubmit,
     PublicBookingCreate, BookingConfirmationResponse,
+    PublicBookingSeriesCreate, BookingSeriesConfirmationResponse,
+    WaitlistJoin, WaitlistEntryResponse, WaitlistOfferResponse,
     AvailableSlotsResponse, TimeSlotResponse,
+    AvailabilityRangeResponse, DayAvailability,
+    NextAvailableResponse, NextAvailableSlot,
+    BundleSlotsResponse,
     ServiceResponse, ServiceListResponse,
     PublicFormResponse, PublicFormSubmit,
 )
 from app.services.services import (
-    get_workspace_by_slug,
-    create_contact, create_conversation,
-    get_services, get_service, get_available_slots,
-    create_booking,
+    get_workspace_by_slug, get_workspace,
+    create_contact, thread_message,
+    get_services, get_service, get_available_slots, get_available_slots_range,
+    get_next_available, get_bundle_slots,
+    create_booking, create_booking_series, SlotUnavailableError,
     get_public_form, submit_public_form,
     send_email, log_automation,
+    idempotency_request_hash, begin_idempotent, save_idempotent, IdempotencyMismatchError,
 )
+from app.services.waitlist_service import join_waitlist, get_offer_details, accept_offer, decline_offer
 from app.models.automation_log import AutomationStatus
+from app.config import settings
 from datetime import date
+from typing import Optional
 
 router = APIRouter()
 
 
+async def _replay_idempotent(db: AsyncSession, scope: str, key: Optional[str], request_hash: str) -> Optional[JSONResponse]:
+    """Stored response for a retried request, or None to process it normally"""
+    if not key:
+        return None
+    try:
+        stored = await begin_idempotent(db, scope, key, request_hash)
+    except IdempotencyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if stored:
+        return JSONResponse(status_code=stored.status_code, content=stored.response_body)
+    return None
+
+
+def _confirmation_email(customer_name: str, service, workspace, booking_date, start_time: str) -> tuple[str, str]:
+    return (
+        f"Booking Confirmed - {service.name}",
+        f"""
+            <h2>Booking Confirmed!</h2>
+            <p>Hi {customer_name},</p>
+            <p>Your booking has been confirmed:</p>
+            <ul>
+                <li><strong>Service:</strong> {service.name}</li>
+                <li><strong>Date:</strong> {booking_date}</li>
+                <li><strong>Time:</strong> {start_time}</li>
+                <li><strong>Duration:</strong> {service.duration_minutes} minutes</li>
+            </ul>
+            <p>Thank you for choosing {workspace.name}!</p>
+            """,
+    )
+
+
 @router.get("/{slug}/services")
 async def get_public_services(
     slug: str,
@@ -79,27 +121,143 @@ async def get_public_slots(
     )
 
 
+@router.get("/{slug}/availability/{service_id}", response_model=AvailabilityRangeResponse)
+async def get_public_availability(
+    slug: str,
+    service_id: str,
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    import uuid
+    try:
+        service = await get_service(db, uuid.UUID(service_id))
+    except ValueError:
+        service = None
+    if not service or service.workspace_id != workspace.id:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    try:
+        start = date.fromisoformat(date_from)
+        end = date.fromisoformat(date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date")
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end - start).days + 1 > settings.AVAILABILITY_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is limited to {settings.AVAILABILITY_MAX_RANGE_DAYS} days",
+        )
+
+    days = await get_available_slots_range(db, service, start, end)
+
+    return AvailabilityRangeResponse(
+        service_id=service.id,
+        service_name=service.name,
+        duration_minutes=service.duration_minutes,
+        days=[
+            DayAvailability(date=d.isoformat(), start_times=[s["start_time"] for s in slots])
+            for d, slots in days.items()
+        ],
+    )
+
+
+@router.get("/{slug}/next-available", response_model=NextAvailableResponse)
+async def get_public_next_available(
+    slug: str,
+    date_from: Optional[str] = Query(None, alias="from"),
+    days: int = 31,
+    db: AsyncSession = Depends(get_db),
+):
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    if days < 1 or days > settings.AVAILABILITY_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"days must be between 1 and {settings.AVAILABILITY_MAX_RANGE_DAYS}",
+        )
+    try:
+        start = date.fromisoformat(date_from) if date_from else date.today()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date")
+
+    found = await get_next_available(db, workspace.id, start, days)
+    slots = [
+        NextAvailableSlot(
+            service_id=f["service_id"],
+            service_name=f["service_name"],
+            date=f["date"].isoformat(),
+            start_time=f["start_time"],
+            end_time=f["end_time"],
+        )
+        for f in found
+    ]
+    return NextAvailableResponse(earliest=slots[0] if slots else None, by_service=slots)
+
+
+@router.get("/{slug}/bundle-slots", response_model=BundleSlotsResponse)
+async def get_public_bundle_slots(
+    slug: str,
+    service_ids: str = Query(..., description="Comma-separated service ids, in booking order"),
+    target_date: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    import uuid
+    try:
+        ids = [uuid.UUID(s.strip()) for s in service_ids.split(",") if s.strip()]
+        d = date.fromisoformat(target_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid service id or date")
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one service is required")
+
+    try:
+        slots = await get_bundle_slots(db, workspace.id, ids, d)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return BundleSlotsResponse(date=target_date, service_ids=ids, slots=slots)
+
+
 @router.post("/{slug}/contact")
 async def submit_contact_form(
     slug: str,
     data: PublicContactSubmit,
     background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
     workspace = await get_workspace_by_slug(db, slug)
     if not workspace:
         raise HTTPException(status_code=404, detail="Business not found")
 
+    scope = f"contact:{slug}"
+    request_hash = idempotency_request_hash(data.model_dump(mode="json"))
+    replay = await _replay_idempotent(db, scope, idempotency_key, request_hash)
+    if replay:
+        return replay
+
     # Create contact
     contact = await create_contact(
         db, workspace.id, data.name, data.email, data.phone, "contact_form"
     )
 
-    # Create conversation with initial message
-    conversation = await create_conversation(
+    # Thread the message into the contact's active conversation
+    await thread_message(
         db, workspace.id, contact.id,
         subject=f"New inquiry from {data.name}",
-        initial_message=data.message or f"New contact form submission from {data.name}",
+        message=data.message or f"New contact form submission from {data.name}",
     )
 
     # Log automation
@@ -121,10 +279,13 @@ async def submit_contact_form(
             db,
         )
 
-    return {
+    response = {
         "message": "Thank you! We will be in touch soon.",
         "contact_id": str(contact.id),
     }
+    if idempotency_key:
+        await save_idempotent(db, scope, idempotency_key, request_hash, 200, response)
+    return response
 
 
 @router.post("/{slug}/book", response_model=BookingConfirmationResponse)
@@ -132,57 +293,119 @@ async def create_public_booking(
     slug: str,
     data: PublicBookingCreate,
     background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
     workspace = await get_workspace_by_slug(db, slug)
     if not workspace:
         raise HTTPException(status_code=404, detail="Business not found")
 
+    # A retry with the same key gets the first response without re-booking
+    scope = f"book:{slug}"
+    request_hash = idempotency_request_hash(data.model_dump(mode="json"))
+    replay = await _replay_idempotent(db, scope, idempotency_key, request_hash)
+    if replay:
+        return replay
+
     service = await get_service(db, data.service_id)
-    if not service:
+    if not service or service.workspace_id != workspace.id:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    # Verify slot is available
-    slots = await get_available_slots(db, data.service_id, data.booking_date)
-    slot_available = any(s["start_time"] == data.start_time for s in slots)
-    if not slot_available:
-        raise HTTPException(status_code=400, detail="Selected time slot is no longer available")
+    contact = await create_contact(
+        db, workspace.id,
+        name=data.customer_name,
+        email=data.customer_email,
+        phone=data.customer_phone,
+        source="booking",
+        flush=False,
+    )
 
     try:
-        booking = await create_booking(db, workspace.id, data.model_dump())
+        booking = await create_booking(db, workspace.id, service, contact, data.model_dump())
+    except SlotUnavailableError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Create conversation for new booking
+    # Thread the booking into the contact's conversation
+    await thread_message(
+        db, workspace.id, contact.id,
+        subject=f"Booking: {service.name} on {data.booking_date}",
+        message=f"New booking for {service.name} on {data.booking_date} at {data.start_time}",
+    )
+
+    # Send confirmation email in background
+    if data.customer_email:
+        background_tasks.add_task(
+            send_email,
+            data.customer_email,
+            *_confirmation_email(data.customer_name, service, workspace, data.booking_date, data.start_time),
+            workspace.id,
+            db,
+        )
+
+    response = BookingConfirmationResponse(
+        booking_id=booking.id,
+        service_name=service.name,
+        booking_date=data.booking_date,
+        start_time=data.start_time,
+        end_time=booking.end_time.isoformat(),
+        status=booking.status,
+    )
+    if idempotency_key:
+        await save_idempotent(db, scope, idempotency_key, request_hash, 200, response.model_dump(mode="json"))
+    return response
+
+
+@router.post("/{slug}/book/series", response_model=BookingSeriesConfirmationResponse)
+async def create_public_booking_series(
+    slug: str,
+    data: PublicBookingSeriesCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    service = await get_service(db, data.service_id)
+    if not service or service.workspace_id != workspace.id:
+        raise HTTPException(status_code=404, detail="Service not found")
+
     contact = await create_contact(
         db, workspace.id,
         name=data.customer_name,
         email=data.customer_email,
         phone=data.customer_phone,
         source="booking",
+        flush=False,
     )
 
-    await create_conversation(
+    try:
+        series, bookings, failed = await create_booking_series(db, workspace.id, service, contact, data.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not bookings:
+        raise HTTPException(status_code=409, detail="None of the requested dates are available")
+
+    dates = ", ".join(str(b.booking_date) for b in bookings)
+    await thread_message(
         db, workspace.id, contact.id,
-        subject=f"Booking: {service.name} on {data.booking_date}",
-        initial_message=f"New booking for {service.name} on {data.booking_date} at {data.start_time}",
+        subject=f"Recurring booking: {service.name}",
+        message=f"New recurring booking for {service.name} at {data.start_time} on {dates}",
     )
 
-    # Send confirmation email in background
     if data.customer_email:
         background_tasks.add_task(
             send_email,
             data.customer_email,
-            f"Booking Confirmed - {service.name}",
+            f"Recurring Booking Confirmed - {service.name}",
             f"""
-            <h2>Booking Confirmed!</h2>
+            <h2>Recurring Booking Confirmed!</h2>
             <p>Hi {data.customer_name},</p>
-            <p>Your booking has been confirmed:</p>
+            <p>Your {service.name} appointments at {data.start_time} are confirmed for:</p>
             <ul>
-                <li><strong>Service:</strong> {service.name}</li>
-                <li><strong>Date:</strong> {data.booking_date}</li>
-                <li><strong>Time:</strong> {data.start_time}</li>
-                <li><strong>Duration:</strong> {service.duration_minutes} minutes</li>
+                {"".join(f"<li>{b.booking_date}</li>" for b in bookings)}
             </ul>
             <p>Thank you for choosing {workspace.name}!</p>
             """,
@@ -190,21 +413,99 @@ async def create_public_booking(
             db,
         )
 
-    from app.utils.helpers import calculate_end_time
-    from datetime import time
-    start = time.fromisoformat(data.start_time)
-    end = calculate_end_time(start, service.duration_minutes)
+    return BookingSeriesConfirmationResponse(
+        series_id=series.id,
+        service_name=service.name,
+        start_time=data.start_time,
+        end_time=bookings[0].end_time.isoformat(),
+        booked=[{"booking_id": b.id, "booking_date": b.booking_date} for b in bookings],
+        failed=failed,
+    )
+
+
+@router.post("/{slug}/waitlist", response_model=WaitlistEntryResponse)
+async def join_public_waitlist(
+    slug: str,
+    data: WaitlistJoin,
+    db: AsyncSession = Depends(get_db),
+):
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    service = await get_service(db, data.service_id)
+    if not service or service.workspace_id != workspace.id:
+        raise HTTPException(status_code=404, detail="Service not found")
+    if not data.customer_email:
+        raise HTTPException(status_code=400, detail="An email address is required to receive offers")
+
+    try:
+        entry = await join_waitlist(db, workspace.id, data.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return WaitlistEntryResponse.model_validate(entry)
+
+
+@router.get("/waitlist/{token}", response_model=WaitlistOfferResponse)
+async def get_waitlist_offer(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+):
+    offer = await get_offer_details(db, token)
+    if not offer:
+        raise HTTPException(status_code=404, detail="Offer not found or no longer available")
+    return WaitlistOfferResponse(**offer)
+
+
+@router.post("/waitlist/{token}/accept", response_model=BookingConfirmationResponse)
+async def accept_waitlist_offer(
+    token: str,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        booking = await accept_offer(db, token)
+    except ValueError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    service = await get_service(db, booking.service_id)
+    workspace = await get_workspace(db, booking.workspace_id)
+    await thread_message(
+        db, booking.workspace_id, booking.contact_id,
+        subject=f"Booking: {service.name} on {booking.booking_date}",
+        message=f"Waitlist booking for {service.name} on {booking.booking_date} at {booking.start_time.strftime('%H:%M')}",
+    )
+    if booking.customer_email:
+        background_tasks.add_task(
+            send_email,
+            booking.customer_email,
+            *_confirmation_email(
+                booking.customer_name, service, workspace, booking.booking_date, booking.start_time.strftime('%H:%M')
+            ),
+            workspace.id,
+            db,
+        )
 
     return BookingConfirmationResponse(
         booking_id=booking.id,
         service_name=service.name,
-        booking_date=data.booking_date,
-        start_time=data.start_time,
-        end_time=end.isoformat(),
+        booking_date=booking.booking_date,
+        start_time=booking.start_time.isoformat(),
+        end_time=booking.end_time.isoformat(),
         status=booking.status,
     )
 
 
+@router.post("/waitlist/{token}/decline")
+async def decline_waitlist_offer(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+):
+    if not await decline_offer(db, token):
+        raise HTTPException(status_code=404, detail="Offer not found")
+    return {"message": "Offer declined"}
+
+
 @router.get("/forms/{token}", response_model=PublicFormResponse)
 async def get_form(
     token: str,
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_db
+from app.models.integration import IntegrationProvider
+from app.schemas import (
+    InboundWebhookPayload, InboundWebhookResponse,
+    StatusCallbackPayload, StatusCallbackResponse,
+)
+from app.services.services import get_workspace_by_slug
+from app.services.messaging_service import ingest_inbound_messages, record_status_events
+from typing import Optional
+import secrets
+
+router = APIRouter()
+
+
+def _verify_webhook_secret(secret: Optional[str]) -> None:
+    if not settings.WEBHOOK_SECRET:
+        if settings.WEBHOOK_ALLOW_UNAUTHENTICATED:
+            return
+        raise HTTPException(status_code=503, detail="Webhooks are not configured")
+    if not secret or not secrets.compare_digest(secret, settings.WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+
+
+def _check_provider(provider: str) -> None:
+    if provider not in [p.value for p in IntegrationProvider]:
+        raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
+
+
+# ============================================================
+# INBOUND MESSAGES
+# ============================================================
+
+@router.post("/{slug}/inbound", response_model=InboundWebhookResponse, status_code=202)
+async def receive_inbound_messages(
+    slug: str,
+    data: InboundWebhookPayload,
+    x_webhook_secret: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    _verify_webhook_secret(x_webhook_secret)
+    _check_provider(data.provider)
+
+    workspace = await get_workspace_by_slug(db, slug)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    try:
+        message_ids = await ingest_inbound_messages(
+            db, workspace.id, [m.model_dump() for m in data.messages]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return InboundWebhookResponse(accepted=len(message_ids), message_ids=message_ids)
+
+
+# ============================================================
+# DELIVERY STATUS
+# ============================================================
+
+@router.post("/status", response_model=StatusCallbackResponse, status_code=202)
+async def receive_status_callbacks(
+    data: StatusCallbackPayload,
+    x_webhook_secret: Optional[str] = Header(None),
+):
+    _verify_webhook_secret(x_webhook_secret)
+    _check_provider(data.provider)
+
+    try:
+        accepted = await record_status_events([e.model_dump() for e in data.events])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StatusCallbackResponse(accepted=accepted)
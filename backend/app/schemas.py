@@ -252,6 +252,41 @@ class ConversationListResponse(BaseModel):
     total: int
 
 
+class InboundMessagePayload(BaseModel):
+    channel: str = "email"
+    from_email: Optional[EmailStr] = None
+    from_phone: Optional[str] = None
+    from_name: Optional[str] = None
+    subject: Optional[str] = None
+    content: str
+    received_at: Optional[datetime] = None
+
+
+class InboundWebhookPayload(BaseModel):
+    provider: str = "mock"
+    messages: list[InboundMessagePayload]
+
+
+class InboundWebhookResponse(BaseModel):
+    accepted: int
+    message_ids: list[UUID]
+
+
+class DeliveryStatusEvent(BaseModel):
+    message_id: UUID
+    status: str
+    occurred_at: Optional[datetime] = None
+
+
+class StatusCallbackPayload(BaseModel):
+    provider: str = "mock"
+    events: list[DeliveryStatusEvent]
+
+
+class StatusCallbackResponse(BaseModel):
+    accepted: int
+
+
 # ============================================================
 # SERVICE SCHEMAS
 # ============================================================
@@ -275,6 +310,35 @@ class AvailabilitySlotResponse(BaseModel):
         from_attributes = True
 
 
+class AvailabilityOverrideCreate(BaseModel):
+    start_date: date
+    end_date: Optional[date] = None
+    kind: str
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    note: Optional[str] = None
+
+
+class AvailabilityOverrideResponse(BaseModel):
+    id: UUID
+    service_id: UUID
+    start_date: date
+    end_date: date
+    kind: str
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    note: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AvailabilityOverrideListResponse(BaseModel):
+    overrides: list[AvailabilityOverrideResponse]
+    total: int
+
+
 class ServiceCreate(BaseModel):
     name: str
     description: Optional[str] = None
@@ -283,6 +347,7 @@ class ServiceCreate(BaseModel):
     location_type: str = "virtual"
     address: Optional[str] = None
     buffer_minutes: int = 0
+    capacity: int = Field(1, ge=1)
     availability_slots: Optional[list[AvailabilitySlotCreate]] = None
 
 
@@ -294,6 +359,7 @@ class ServiceUpdate(BaseModel):
     location_type: Optional[str] = None
     address: Optional[str] = None
     buffer_minutes: Optional[int] = None
+    capacity: Optional[int] = Field(None, ge=1)
     is_active: Optional[bool] = None
 
 
@@ -307,6 +373,7 @@ class ServiceResponse(BaseModel):
     location_type: str
     address: Optional[str] = None
     buffer_minutes: int
+    capacity: int = 1
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -334,6 +401,50 @@ class AvailableSlotsResponse(BaseModel):
     slots: list[TimeSlotResponse]
 
 
+class BundleSegment(BaseModel):
+    service_id: UUID
+    service_name: str
+    start_time: str
+    end_time: str
+
+
+class BundleSlot(BaseModel):
+    start_time: str
+    end_time: str
+    segments: list[BundleSegment]
+
+
+class BundleSlotsResponse(BaseModel):
+    date: str
+    service_ids: list[UUID]
+    slots: list[BundleSlot]
+
+
+class DayAvailability(BaseModel):
+    date: str
+    start_times: list[str]
+
+
+class AvailabilityRangeResponse(BaseModel):
+    service_id: UUID
+    service_name: str
+    duration_minutes: int
+    days: list[DayAvailability]
+
+
+class NextAvailableSlot(BaseModel):
+    service_id: UUID
+    service_name: str
+    date: str
+    start_time: str
+    end_time: str
+
+
+class NextAvailableResponse(BaseModel):
+    earliest: Optional[NextAvailableSlot] = None
+    by_service: list[NextAvailableSlot]
+
+
 # ============================================================
 # BOOKING SCHEMAS
 # ============================================================
@@ -352,6 +463,21 @@ class BookingStatusUpdate(BaseModel):
     status: str
 
 
+class BookingStatusBatchItem(BaseModel):
+    id: UUID
+    status: str
+
+
+class BookingStatusBatchUpdate(BaseModel):
+    updates: list[BookingStatusBatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BookingStatusBatchResponse(BaseModel):
+    updated: int
+    booking_ids: list[UUID]
+    not_found: list[UUID]
+
+
 class BookingResponse(BaseModel):
     id: UUID
     workspace_id: UUID
@@ -378,6 +504,21 @@ class BookingResponse(BaseModel):
 class BookingListResponse(BaseModel):
     bookings: list[BookingResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class CalendarBucket(BaseModel):
+    start: str  # date, or date + hour for hourly buckets
+    total: int
+    by_status: dict[str, int]
+    by_service: dict[str, int]
+
+
+class BookingCalendarResponse(BaseModel):
+    date_from: date
+    date_to: date
+    granularity: str
+    buckets: list[CalendarBucket]
 
 
 class PublicBookingCreate(BaseModel):
@@ -400,6 +541,87 @@ class BookingConfirmationResponse(BaseModel):
     message: str = "Booking confirmed successfully!"
 
 
+class PublicBookingSeriesCreate(PublicBookingCreate):
+    # booking_date is the first occurrence
+    interval_weeks: int = Field(1, ge=1)
+    count: Optional[int] = Field(None, ge=1)
+    until: Optional[date] = None
+
+
+class WaitlistJoin(BaseModel):
+    service_id: UUID
+    date_from: date
+    date_to: date
+    earliest_time: Optional[str] = None
+    latest_time: Optional[str] = None
+    customer_name: str
+    customer_email: Optional[EmailStr] = None
+    customer_phone: Optional[str] = None
+
+
+class WaitlistEntryResponse(BaseModel):
+    id: UUID
+    service_id: UUID
+    date_from: date
+    date_to: date
+    earliest_time: Optional[time] = None
+    latest_time: Optional[time] = None
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class WaitlistOfferResponse(BaseModel):
+    business_name: str
+    service_name: str
+    booking_date: date
+    start_time: str
+    end_time: str
+    expires_at: Optional[datetime] = None
+
+
+class SeriesOccurrence(BaseModel):
+    booking_id: UUID
+    booking_date: date
+
+
+class SeriesFailure(BaseModel):
+    booking_date: date
+    reason: str  # "conflict" or "unavailable"
+
+
+class BookingSeriesConfirmationResponse(BaseModel):
+    series_id: UUID
+    service_name: str
+    start_time: str
+    end_time: str
+    booked: list[SeriesOccurrence]
+    failed: list[SeriesFailure]
+
+
+class CalendarFeedCreate(BaseModel):
+    name: str = "Bookings"
+    service_id: Optional[UUID] = None
+
+
+class CalendarFeedResponse(BaseModel):
+    id: UUID
+    service_id: Optional[UUID] = None
+    name: str
+    token: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarFeedListResponse(BaseModel):
+    feeds: list[CalendarFeedResponse]
+    total: int
+
+
 # ============================================================
 # FORM SCHEMAS
 # ============================================================
@@ -437,6 +659,7 @@ class FormTemplateResponse(BaseModel):
     description: Optional[str] = None
     fields: list[dict]
     linked_service_ids: Optional[list] = None
+    applies_to_all_services: bool = True
     deadline_hours: Optional[int] = None
     is_active: bool
     created_at: datetime
@@ -473,6 +696,7 @@ class FormSubmissionResponse(BaseModel):
 class FormSubmissionListResponse(BaseModel):
     submissions: list[FormSubmissionResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class PublicFormResponse(BaseModel):
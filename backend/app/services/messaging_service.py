@@ -0,0 +1,331 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, bindparam, func, case, values, column, and_, DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.config import settings
+from app.database import async_session, ensure_message_partitions
+from app.models.contact import ContactSource
+from app.models.conversation import Conversation, ConversationStatus
+from app.models.integration import Integration, IntegrationType, IntegrationStatus
+from app.models.alert import AlertType, AlertSeverity
+from app.models.message import Message, ArchivedMessage, MessageDirection, MessageChannel, MessageSenderType, MessageStatus
+from app.services.services import find_contact, create_contact, thread_message, create_alert
+from app.utils.batching import BatchWriter
+from app.utils.helpers import normalize_email, normalize_phone
+
+
+# ============================================================
+# INBOUND MESSAGE INGESTION
+# ============================================================
+
+class InboundMessageWriter(BatchWriter):
+    """Writes buffered inbound messages with one multi-row INSERT per batch"""
+
+    async def _write(self, batch: list[dict]) -> None:
+        latest: dict[uuid.UUID, datetime] = {}
+        for row in batch:
+            conv_id = row["conversation_id"]
+            if conv_id not in latest or row["created_at"] > latest[conv_id]:
+                latest[conv_id] = row["created_at"]
+
+        conversations = Conversation.__table__
+        bump = (
+            update(conversations)
+            .where(conversations.c.id == bindparam("b_id"))
+            .values(
+                last_message_at=func.greatest(
+                    conversations.c.last_message_at, bindparam("b_ts", type_=DateTime)
+                ),
+                is_read=False,
+                updated_at=bindparam("b_now", type_=DateTime),
+            )
+        )
+        now = datetime.utcnow()
+
+        async with async_session() as session:
+            await session.execute(insert(Message), batch)
+            await session.execute(
+                bump,
+                [{"b_id": cid, "b_ts": ts, "b_now": now} for cid, ts in latest.items()],
+            )
+            await session.commit()
+
+
+inbound_writer = InboundMessageWriter(
+    max_batch=settings.INBOUND_BATCH_SIZE,
+    flush_interval=settings.INBOUND_FLUSH_INTERVAL_MS / 1000,
+)
+
+
+def _to_utc_naive(dt: datetime | None) -> datetime:
+    if dt is None:
+        return datetime.utcnow()
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+async def ingest_inbound_messages(db: AsyncSession, workspace_id: uuid.UUID, messages: list[dict]) -> list[uuid.UUID]:
+    """Resolve contact and conversation for each message and queue it for a batched insert"""
+    rows = []
+    threads: dict[str, uuid.UUID] = {}
+
+    for m in messages:
+        channel = m.get("channel") or MessageChannel.EMAIL.value
+        if channel not in (MessageChannel.EMAIL.value, MessageChannel.SMS.value):
+            raise ValueError(f"Unsupported inbound channel: {channel}")
+
+        email = normalize_email(m.get("from_email"))
+        phone = normalize_phone(m.get("from_phone"))
+        handle = email or phone
+        if not handle:
+            raise ValueError("Inbound message needs a sender email or phone")
+
+        conversation_id = threads.get(handle)
+        if conversation_id is None:
+            contact = await find_contact(db, workspace_id, email, phone)
+            if not contact:
+                contact = await create_contact(
+                    db, workspace_id,
+                    name=m.get("from_name") or handle,
+                    email=email,
+                    phone=phone,
+                    source=ContactSource.INBOUND,
+                )
+
+            conversation = await thread_message(
+                db, workspace_id, contact.id,
+                subject=m.get("subject") or f"New message from {contact.name}",
+            )
+            conversation_id = conversation.id
+            threads[handle] = conversation_id
+
+        rows.append({
+            "id": uuid.uuid4(),
+            "conversation_id": conversation_id,
+            "direction": MessageDirection.INBOUND,
+            "channel": channel,
+            "sender_type": MessageSenderType.CUSTOMER,
+            "subject": m.get("subject"),
+            "content": m["content"],
+            "status": MessageStatus.DELIVERED,
+            "created_at": _to_utc_naive(m.get("received_at")),
+        })
+
+    # New contacts/conversations must be visible to the writer's own session
+    # before their messages are inserted.
+    await db.commit()
+
+    for row in rows:
+        await inbound_writer.add(row["id"], row)
+
+    return [row["id"] for row in rows]
+
+
+# ============================================================
+# DELIVERY STATUS CALLBACKS
+# ============================================================
+
+# Later stages win; a callback can never move a message back to an earlier one.
+STATUS_RANK = {
+    MessageStatus.PENDING.value: 0,
+    MessageStatus.SENT.value: 1,
+    MessageStatus.DELIVERED.value: 2,
+    MessageStatus.FAILED.value: 2,
+}
+
+DELIVERY_HEALTH_ERROR = "Delivery failure rate"
+
+
+class StatusCallbackWriter(BatchWriter):
+    """Coalesces status callbacks per message and applies each batch with one UPDATE ... FROM (VALUES ...)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (workspace_id, channel) -> [events, failures] since the last health check
+        self._health: dict[tuple[uuid.UUID, str], list[int]] = {}
+
+    def _merge(self, old: dict, new: dict) -> dict:
+        # Same rule as the UPDATE: the later stage wins, whatever order the
+        # callbacks arrived in. Time only decides between equal stages
+        # (delivered vs failed).
+        old_rank, new_rank = STATUS_RANK[old["status"]], STATUS_RANK[new["status"]]
+        if old_rank != new_rank:
+            return new if new_rank > old_rank else old
+        return new if new["occurred_at"] >= old["occurred_at"] else old
+
+    async def _write(self, batch: list[dict]) -> None:
+        messages = Message.__table__
+        conversations = Conversation.__table__
+        v = values(
+            column("id", UUID(as_uuid=True)),
+            column("status", messages.c.status.type),
+            column("rank", Integer),
+            name="v",
+        ).data([(e["message_id"], e["status"], STATUS_RANK[e["status"]]) for e in batch])
+
+        current_rank = case(
+            {MessageStatus.PENDING: 0, MessageStatus.SENT: 1},
+            value=messages.c.status,
+            else_=2,
+        )
+        stmt = (
+            update(messages)
+            .where(
+                and_(
+                    messages.c.id == v.c.id,
+                    conversations.c.id == messages.c.conversation_id,
+                    v.c.rank >= current_rank,
+                )
+            )
+            .values(status=v.c.status)
+            .returning(conversations.c.workspace_id, messages.c.channel, messages.c.status)
+        )
+
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            await self._update_health(session, result.all())
+            await session.commit()
+
+    async def _update_health(self, session: AsyncSession, rows: list) -> None:
+        for workspace_id, channel, status in rows:
+            if channel not in (MessageChannel.EMAIL, MessageChannel.SMS):
+                continue
+            counts = self._health.setdefault((workspace_id, channel), [0, 0])
+            counts[0] += 1
+            if status == MessageStatus.FAILED:
+                counts[1] += 1
+
+        now = datetime.utcnow()
+        for (workspace_id, channel), (total, failed) in list(self._health.items()):
+            if total < settings.INTEGRATION_HEALTH_MIN_EVENTS:
+                continue
+            del self._health[(workspace_id, channel)]
+
+            rate = failed / total
+            integration_type = IntegrationType(MessageChannel(channel).value)
+            if rate >= settings.INTEGRATION_FAILURE_RATE_THRESHOLD:
+                error = f"{DELIVERY_HEALTH_ERROR} {rate:.0%} over the last {total} messages"
+                result = await session.execute(
+                    update(Integration)
+                    .where(
+                        and_(
+                            Integration.workspace_id == workspace_id,
+                            Integration.type == integration_type,
+                            Integration.status == IntegrationStatus.ACTIVE,
+                        )
+                    )
+                    .values(status=IntegrationStatus.FAILED, last_error=error, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    await create_alert(
+                        session, workspace_id,
+                        AlertType.INTEGRATION_FAILED,
+                        f"{integration_type.value.upper()} delivery failing",
+                        error,
+                        AlertSeverity.CRITICAL,
+                        "/dashboard/settings",
+                    )
+            else:
+                # Recover integrations that were only failed by this health check
+                await session.execute(
+                    update(Integration)
+                    .where(
+                        and_(
+                            Integration.workspace_id == workspace_id,
+                            Integration.type == integration_type,
+                            Integration.status == IntegrationStatus.FAILED,
+                            Integration.last_error.startswith(DELIVERY_HEALTH_ERROR),
+                        )
+                    )
+                    .values(status=IntegrationStatus.ACTIVE, last_error=None, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+
+
+status_writer = StatusCallbackWriter(
+    max_batch=settings.STATUS_BATCH_SIZE,
+    flush_interval=settings.STATUS_FLUSH_INTERVAL_MS / 1000,
+)
+
+
+async def record_status_events(events: list[dict]) -> int:
+    """Queue provider delivery callbacks; updates are applied by status_writer"""
+    allowed = (MessageStatus.SENT.value, MessageStatus.DELIVERED.value, MessageStatus.FAILED.value)
+    for e in events:
+        if e["status"] not in allowed:
+            raise ValueError(f"Unsupported delivery status: {e['status']}")
+
+    for e in events:
+        await status_writer.add(e["message_id"], {
+            "message_id": e["message_id"],
+            "status": e["status"],
+            "occurred_at": _to_utc_naive(e.get("occurred_at")),
+        })
+    return len(events)
+
+
+# ============================================================
+# RETENTION
+# ============================================================
+
+async def archive_cold_conversations(db: AsyncSession) -> int:
+    """Move messages of closed conversations past the retention horizon into messages_archive"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.MESSAGE_ARCHIVE_AFTER_DAYS)
+    result = await db.execute(
+        select(Conversation.id)
+        .where(
+            and_(
+                Conversation.status == ConversationStatus.CLOSED,
+                Conversation.archived_at == None,
+                func.coalesce(Conversation.last_message_at, Conversation.created_at) < cutoff,
+            )
+        )
+        .limit(settings.MESSAGE_ARCHIVE_BATCH)
+    )
+    conversation_ids = result.scalars().all()
+    if not conversation_ids:
+        return 0
+
+    columns = [c.name for c in Message.__table__.columns]
+    moved = (
+        delete(Message.__table__)
+        .where(Message.__table__.c.conversation_id.in_(conversation_ids))
+        .returning(*Message.__table__.columns)
+        .cte("moved")
+    )
+    await db.execute(
+        insert(ArchivedMessage.__table__).from_select(
+            columns, select(*[moved.c[name] for name in columns])
+        )
+    )
+    now = datetime.utcnow()
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.id.in_(conversation_ids))
+        .values(archived_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return len(conversation_ids)
+
+
+async def run_message_maintenance() -> None:
+    """Background loop: keep future partitions in place and archive cold threads.
+
+    Archiving only runs on the partitioned messages layout it was written for.
+    """
+    while True:
+        try:
+            if await ensure_message_partitions():
+                async with async_session() as session:
+                    archived = await archive_cold_conversations(session)
+                    await session.commit()
+                if archived:
+                    print(f"🗄️ Archived messages of {archived} conversations")
+        except Exception as e:
+            print(f"❌ Message maintenance failed: {e}")
+        await asyncio.sleep(settings.MESSAGE_MAINTENANCE_INTERVAL_HOURS * 3600)
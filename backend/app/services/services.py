@@ -1,25 +1,40 @@
+import asyncio
+import hashlib
+import json
+import secrets
 import uuid
+import numpy as np
 from datetime import datetime, date, time, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, func, and_, or_, case, cast, values, column, event, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, UUID, insert as pg_insert
+from sqlalchemy.orm import Session, selectinload, noload
 
+from app.config import settings
+from app.database import async_session
 from app.models.contact import Contact, ContactSource
 from app.models.conversation import Conversation, ConversationStatus
-from app.models.message import Message, MessageDirection, MessageChannel, MessageSenderType, MessageStatus
+from app.models.message import Message, ArchivedMessage, MessageDirection, MessageChannel, MessageSenderType, MessageStatus
 from app.models.service import Service
-from app.models.availability import AvailabilitySlot
-from app.models.booking import Booking, BookingStatus
-from app.models.form_template import FormTemplate
+from app.models.availability import AvailabilitySlot, AvailabilityOverride, OverrideKind
+from app.models.booking import Booking, BookingSeries, BookingStatus
+from app.models.form_template import FormTemplate, FormTemplateService
 from app.models.form_submission import FormSubmission, FormSubmissionStatus
 from app.models.inventory import InventoryItem
 from app.models.integration import Integration, IntegrationStatus
 from app.models.automation_log import AutomationLog, AutomationStatus
 from app.models.alert import Alert, AlertType, AlertSeverity
+from app.models.calendar_feed import CalendarFeed
+from app.models.idempotency_key import IdempotencyKey
 from app.models.workspace import Workspace, WorkspaceStatus
 from app.models.user import User, UserRole, UserStatus
-from app.utils.helpers import calculate_end_time, time_slots, generate_slug
+from app.utils.helpers import calculate_end_time, generate_slug, normalize_email, normalize_phone, encode_cursor, decode_cursor
+from app.utils.availability import to_minutes, minutes_to_iso, free_slots, format_slots, free_intervals, bundle_starts, OverrideRule, OverrideIndex
+from app.utils.availability_index import MINUTES_PER_DAY, day_bitmap, start_grid, fits, first_fit
+from app.utils.snapshot import SnapshotStore
+from app.utils.cache import LRUCache
+from app.utils import ics
 
 
 # ============================================================
@@ -183,29 +198,50 @@ async def get_active_email_integration(db: AsyncSession, workspace_id: uuid.UUID
 # CONTACT SERVICE
 # ============================================================
 
-async def create_contact(db: AsyncSession, workspace_id: uuid.UUID, name: str, email: str = None, phone: str = None, source: str = "contact_form", notes: str = None) -> Contact:
-    # Check for existing contact
+async def find_contact(db: AsyncSession, workspace_id: uuid.UUID, email: str = None, phone: str = None) -> Optional[Contact]:
+    """Resolve a contact by normalized email, then normalized phone"""
+    email = normalize_email(email)
     if email:
         result = await db.execute(
-            select(Contact).where(
-                and_(Contact.workspace_id == workspace_id, Contact.email == email)
-            )
+            select(Contact)
+            .where(and_(Contact.workspace_id == workspace_id, func.lower(Contact.email) == email))
+            .order_by(Contact.created_at)
+            .limit(1)
         )
-        existing = result.scalar_one_or_none()
+        existing = result.scalars().first()
         if existing:
             return existing
 
+    phone = normalize_phone(phone)
     if phone:
         result = await db.execute(
-            select(Contact).where(
-                and_(Contact.workspace_id == workspace_id, Contact.phone == phone)
+            select(Contact)
+            .where(
+                and_(
+                    Contact.workspace_id == workspace_id,
+                    func.regexp_replace(Contact.phone, "[^0-9+]", "", "g") == phone,
+                )
             )
+            .order_by(Contact.created_at)
+            .limit(1)
         )
-        existing = result.scalar_one_or_none()
+        existing = result.scalars().first()
         if existing:
             return existing
 
+    return None
+
+
+async def create_contact(db: AsyncSession, workspace_id: uuid.UUID, name: str, email: str = None, phone: str = None, source: str = "contact_form", notes: str = None, flush: bool = True) -> Contact:
+    # Check for existing contact
+    existing = await find_contact(db, workspace_id, email, phone)
+    if existing:
+        return existing
+
+    # The id is assigned up front so callers passing flush=False can reference
+    # the contact before it is written
     contact = Contact(
+        id=uuid.uuid4(),
         workspace_id=workspace_id,
         name=name,
         email=email,
@@ -214,7 +250,8 @@ async def create_contact(db: AsyncSession, workspace_id: uuid.UUID, name: str, e
         notes=notes,
     )
     db.add(contact)
-    await db.flush()
+    if flush:
+        await db.flush()
     return contact
 
 
@@ -268,6 +305,63 @@ async def create_conversation(db: AsyncSession, workspace_id: uuid.UUID, contact
     return conversation
 
 
+def _thread_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.CONVERSATION_REUSE_WINDOW_HOURS)
+
+
+async def get_active_conversation(db: AsyncSession, workspace_id: uuid.UUID, contact_id: uuid.UUID) -> Optional[Conversation]:
+    """Most recent active conversation for a contact still inside the reuse window"""
+    result = await db.execute(
+        select(Conversation)
+        .where(
+            and_(
+                Conversation.workspace_id == workspace_id,
+                Conversation.contact_id == contact_id,
+                Conversation.status == ConversationStatus.ACTIVE,
+                Conversation.last_message_at >= _thread_cutoff(),
+            )
+        )
+        .order_by(Conversation.last_message_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def thread_message(db: AsyncSession, workspace_id: uuid.UUID, contact_id: uuid.UUID, subject: str = None, message: str = None) -> Conversation:
+    """Append an inbound message to the contact's active thread, opening a new one after the inactivity window"""
+    conversation = await get_active_conversation(db, workspace_id, contact_id)
+    if not conversation:
+        # Idle threads are closed so each contact has at most one active thread
+        await db.execute(
+            update(Conversation)
+            .where(
+                and_(
+                    Conversation.workspace_id == workspace_id,
+                    Conversation.contact_id == contact_id,
+                    Conversation.status == ConversationStatus.ACTIVE,
+                )
+            )
+            .values(status=ConversationStatus.CLOSED, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return await create_conversation(db, workspace_id, contact_id, subject=subject, initial_message=message)
+
+    if message:
+        db.add(Message(
+            conversation_id=conversation.id,
+            direction=MessageDirection.INBOUND,
+            channel=MessageChannel.EMAIL,
+            sender_type=MessageSenderType.CUSTOMER,
+            subject=subject,
+            content=message,
+            status=MessageStatus.DELIVERED,
+        ))
+    conversation.last_message_at = datetime.utcnow()
+    conversation.is_read = False
+    await db.flush()
+    return conversation
+
+
 async def get_conversations(db: AsyncSession, workspace_id: uuid.UUID) -> list:
     result = await db.execute(
         select(Conversation)
@@ -313,6 +407,16 @@ async def get_conversation_detail(db: AsyncSession, conversation_id: uuid.UUID)
     conv.is_read = True
     await db.flush()
 
+    messages = list(conv.messages)
+    if conv.archived_at:
+        # Cold threads live in messages_archive; anything sent after archival is still live
+        archived = await db.execute(
+            select(ArchivedMessage)
+            .where(ArchivedMessage.conversation_id == conv.id)
+            .order_by(ArchivedMessage.created_at)
+        )
+        messages = list(archived.scalars().all()) + messages
+
     return {
         "id": conv.id,
         "workspace_id": conv.workspace_id,
@@ -339,7 +443,7 @@ async def get_conversation_detail(db: AsyncSession, conversation_id: uuid.UUID)
                 "status": m.status,
                 "created_at": m.created_at,
             }
-            for m in conv.messages
+            for m in messages
         ],
     }
 
@@ -386,6 +490,7 @@ async def create_service(db: AsyncSession, workspace_id: uuid.UUID, data: dict)
         location_type=data.get("location_type", "virtual"),
         address=data.get("address"),
         buffer_minutes=data.get("buffer_minutes", 0),
+        capacity=data.get("capacity", 1),
     )
     db.add(service)
     await db.flush()
@@ -409,7 +514,7 @@ async def create_service(db: AsyncSession, workspace_id: uuid.UUID, data: dict)
 async def get_services(db: AsyncSession, workspace_id: uuid.UUID) -> list[Service]:
     result = await db.execute(
         select(Service)
-        .options(selectinload(Service.availability_slots))
+        .options(selectinload(Service.availability_slots), selectinload(Service.availability_overrides))
         .where(Service.workspace_id == workspace_id)
         .order_by(Service.created_at.desc())
     )
@@ -419,7 +524,7 @@ async def get_services(db: AsyncSession, workspace_id: uuid.UUID) -> list[Servic
 async def get_service(db: AsyncSession, service_id: uuid.UUID) -> Optional[Service]:
     result = await db.execute(
         select(Service)
-        .options(selectinload(Service.availability_slots))
+        .options(selectinload(Service.availability_slots), selectinload(Service.availability_overrides))
         .where(Service.id == service_id)
     )
     return result.scalar_one_or_none()
@@ -431,209 +536,776 @@ async def update_service(db: AsyncSession, service: Service, data: dict) -> Serv
             setattr(service, key, value)
     service.updated_at = datetime.utcnow()
     await db.flush()
+    invalidate_availability(db, service.id)
     return service
 
 
 async def delete_service(db: AsyncSession, service: Service):
+    service_id = service.id
     await db.delete(service)
     await db.flush()
+    invalidate_availability(db, service_id)
+
+
+async def create_availability_override(db: AsyncSession, service_id: uuid.UUID, data: dict) -> AvailabilityOverride:
+    if data["kind"] not in [k.value for k in OverrideKind]:
+        raise ValueError(f"Invalid override kind: {data['kind']}")
+
+    start_time = time.fromisoformat(data["start_time"]) if data.get("start_time") else None
+    end_time = time.fromisoformat(data["end_time"]) if data.get("end_time") else None
+    if data["kind"] == OverrideKind.CLOSED:
+        start_time = end_time = None
+    elif not start_time or not end_time or end_time <= start_time:
+        raise ValueError("start_time and end_time are required and end_time must be after start_time")
+
+    end_date = data.get("end_date") or data["start_date"]
+    if end_date < data["start_date"]:
+        raise ValueError("end_date must not be before start_date")
+
+    override = AvailabilityOverride(
+        service_id=service_id,
+        start_date=data["start_date"],
+        end_date=end_date,
+        kind=data["kind"],
+        start_time=start_time,
+        end_time=end_time,
+        note=data.get("note"),
+    )
+    db.add(override)
+    await db.flush()
+    invalidate_availability(db, service_id)
+    return override
 
 
-async def get_available_slots(db: AsyncSession, service_id: uuid.UUID, target_date: date) -> list[dict]:
-    service = await get_service(db, service_id)
-    if not service:
-        return []
-
-    day_of_week = target_date.weekday()
+async def get_availability_overrides(db: AsyncSession, service_id: uuid.UUID) -> list[AvailabilityOverride]:
+    result = await db.execute(
+        select(AvailabilityOverride)
+        .where(AvailabilityOverride.service_id == service_id)
+        .order_by(AvailabilityOverride.start_date, AvailabilityOverride.created_at)
+    )
+    return result.scalars().all()
 
-    # Get availability for this day
-    available = [s for s in service.availability_slots if s.day_of_week == day_of_week and s.is_active]
-    if not available:
-        return []
 
-    # Get existing bookings for this date
+async def delete_availability_override(db: AsyncSession, service_id: uuid.UUID, override_id: uuid.UUID) -> bool:
     result = await db.execute(
-        select(Booking).where(
+        select(AvailabilityOverride).where(
             and_(
-                Booking.service_id == service_id,
-                Booking.booking_date == target_date,
-                Booking.status.in_(["confirmed", "pending"]),
+                AvailabilityOverride.id == override_id,
+                AvailabilityOverride.service_id == service_id,
             )
         )
     )
-    existing_bookings = result.scalars().all()
-    booked_times = [(b.start_time, b.end_time) for b in existing_bookings]
+    override = result.scalar_one_or_none()
+    if not override:
+        return False
+    await db.delete(override)
+    await db.flush()
+    invalidate_availability(db, service_id)
+    return True
+
+
+class ServiceTemplate(NamedTuple):
+    """The parts of a service that slot computation needs, by weekday"""
+    duration: int
+    buffer: int
+    windows: dict[int, list[tuple[int, int]]]
+    overrides: OverrideIndex
+    capacity: int = 1
+
+
+# Computed availability inputs. Templates (service hours) and booked intervals
+# are cached separately so the "not in the past" cut-off for today is always
+# applied fresh on top of cached data.
+availability_templates = LRUCache(
+    maxsize=settings.AVAILABILITY_CACHE_SIZE, ttl=settings.AVAILABILITY_CACHE_TTL_SECONDS
+)
+booked_intervals_cache = LRUCache(
+    maxsize=settings.AVAILABILITY_CACHE_SIZE, ttl=settings.AVAILABILITY_CACHE_TTL_SECONDS
+)
+
+
+def _service_template(service: Service) -> ServiceTemplate:
+    windows: dict[int, list[tuple[int, int]]] = {}
+    for s in service.availability_slots:
+        if s.is_active:
+            windows.setdefault(s.day_of_week, []).append((to_minutes(s.start_time), to_minutes(s.end_time)))
+    overrides = OverrideIndex(
+        OverrideRule(
+            o.start_date,
+            o.end_date,
+            o.kind,
+            (to_minutes(o.start_time), to_minutes(o.end_time)) if o.start_time and o.end_time else None,
+        )
+        for o in service.availability_overrides
+    )
+    return ServiceTemplate(service.duration_minutes, service.buffer_minutes, windows, overrides, service.capacity or 1)
+
+
+def _windows_for(template: ServiceTemplate, day: date) -> list[tuple[int, int]]:
+    """Weekly hours for the day with any date-specific overrides applied"""
+    return template.overrides.windows_for(day, template.windows.get(day.weekday(), []))
+
+
+async def get_service_template(db: AsyncSession, service_id: uuid.UUID) -> Optional[ServiceTemplate]:
+    template = availability_templates.get(service_id)
+    if template is None:
+        service = await get_service(db, service_id)
+        if not service:
+            return None
+        template = _service_template(service)
+        availability_templates.set(service_id, template)
+    return template
+
+
+def _drop_availability(service_id: uuid.UUID, booking_date: Optional[date]) -> None:
+    if booking_date is None:
+        availability_templates.invalidate(service_id)
+        booked_intervals_cache.invalidate_where(lambda key: key[0] == service_id)
+    else:
+        booked_intervals_cache.invalidate((service_id, booking_date))
+
+
+def invalidate_availability(db: AsyncSession, service_id: uuid.UUID, booking_date: date = None) -> None:
+    """Drop cached availability for a service (or one of its dates).
+
+    Dropped now and again after commit, so a concurrent reader cannot
+    re-cache the pre-commit state for the length of the TTL.
+    """
+    _drop_availability(service_id, booking_date)
+    db.sync_session.info.setdefault("availability_invalidations", set()).add((service_id, booking_date))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_availability_invalidations(session: Session) -> None:
+    changed = set()
+    for service_id, booking_date in session.info.pop("availability_invalidations", ()):
+        _drop_availability(service_id, booking_date)
+        changed.add(service_id)
+    if snapshot_store:
+        for service_id in changed:
+            _mark_snapshot_changed(service_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_availability_invalidations(session: Session) -> None:
+    session.info.pop("availability_invalidations", None)
+
+
+# Cross-worker snapshot files, enabled by AVAILABILITY_SNAPSHOT_DIR
+snapshot_store = SnapshotStore(settings.AVAILABILITY_SNAPSHOT_DIR) if settings.AVAILABILITY_SNAPSHOT_DIR else None
+_snapshot_rebuilds: dict[uuid.UUID, asyncio.Task] = {}  # running rebuilds, referenced until done
+_snapshot_bumps: dict[uuid.UUID, int] = {}  # data_version bumps queued by this worker, not yet written
+_snapshot_bump_tasks: set[asyncio.Task] = set()
+
+
+def _mark_snapshot_changed(service_id: uuid.UUID) -> None:
+    """Bump the service's data_version from a worker thread (it takes a file lock).
+
+    Until the bump is written this worker ignores the snapshot, so it cannot
+    serve the pre-commit state in the meantime.
+    """
+    _snapshot_bumps[service_id] = _snapshot_bumps.get(service_id, 0) + 1
+    task = asyncio.create_task(_write_snapshot_bump(service_id))
+    _snapshot_bump_tasks.add(task)
+    task.add_done_callback(_snapshot_bump_tasks.discard)
+
+
+async def _write_snapshot_bump(service_id: uuid.UUID) -> None:
+    try:
+        await asyncio.to_thread(snapshot_store.mark_changed, service_id)
+    except Exception as e:
+        print(f"❌ Availability snapshot invalidation failed for {service_id}: {e}")
+    finally:
+        remaining = _snapshot_bumps.pop(service_id, 1) - 1
+        if remaining:
+            _snapshot_bumps[service_id] = remaining
+
+
+def availability_cache_stats() -> dict:
+    return {
+        "templates": availability_templates.stats(),
+        "booked_intervals": booked_intervals_cache.stats(),
+    }
+
+
+def _slots_for_day(template: ServiceTemplate, target_date: date, booked: list[tuple[int, int]], now: datetime) -> list[tuple[int, int]]:
+    windows = _windows_for(template, target_date)
+    if not windows:
+        return []
+
+    # Skip past times for today
+    not_before = None
+    if target_date == now.date():
+        not_before = to_minutes(now.time())
+
+    return free_slots(windows, booked, template.duration, template.buffer, not_before)
+
+
+async def _booked_intervals(db: AsyncSession, service_id: uuid.UUID, date_from: date, date_to: date, cached: bool = True, capacity: int = 1,
+                            exclude: Optional[uuid.UUID] = None) -> dict[date, list[tuple[int, int]]]:
+    """Blocking booking intervals per date for one service; uncached days come from a single range query.
+
+    Bookings are counted per (date, start, end): an interval blocks only once
+    it holds `capacity` bookings, so group services keep offering a slot until
+    it is full. With capacity 1 every booked interval blocks. `exclude` leaves
+    one booking out (reading around a hold); such results are never cached.
+    """
+    if exclude is not None:
+        cached = False
+    booked: dict[date, list[tuple[int, int]]] = {}
+    missing = []
+    day = date_from
+    while day <= date_to:
+        hit = booked_intervals_cache.get((service_id, day)) if cached else None
+        if hit is None:
+            missing.append(day)
+        else:
+            booked[day] = hit
+        day += timedelta(days=1)
+
+    if not missing:
+        return booked
+
+    conditions = [
+        Booking.service_id == service_id,
+        Booking.booking_date >= missing[0],
+        Booking.booking_date <= missing[-1],
+        Booking.status.in_(["confirmed", "pending"]),
+    ]
+    if exclude is not None:
+        conditions.append(Booking.id != exclude)
+    result = await db.execute(
+        select(Booking.booking_date, Booking.start_time, Booking.end_time)
+        .where(and_(*conditions))
+        .group_by(Booking.booking_date, Booking.start_time, Booking.end_time)
+        .having(func.count() >= capacity)
+    )
+    fetched: dict[date, list[tuple[int, int]]] = {day: [] for day in missing}
+    for booking_date, start, end in result.all():
+        if booking_date in fetched:
+            fetched[booking_date].append((to_minutes(start), to_minutes(end)))
+
+    for day, intervals in fetched.items():
+        if exclude is None:
+            booked_intervals_cache.set((service_id, day), intervals)
+        booked[day] = intervals
+    return booked
+
+
+def _snapshot_slots(service_id: uuid.UUID, target_date: date, now: datetime) -> Optional[list[tuple[int, int]]]:
+    """Slots from the shared snapshot, or None when it cannot answer.
+
+    A rebuild is scheduled only when the snapshot is missing, stale or starts
+    before today. Days outside a current snapshot's range go to the database
+    without one, since a rebuild would not cover them either.
+    """
+    if not snapshot_store or service_id in _snapshot_bumps:
+        return None
+    not_before = to_minutes(now.time()) if target_date == now.date() else None
+    slots = snapshot_store.slots(service_id, target_date, not_before)
+    if slots is None and service_id not in _snapshot_rebuilds and snapshot_store.needs_rebuild(service_id):
+        _snapshot_rebuilds[service_id] = asyncio.create_task(rebuild_availability_snapshot(service_id))
+    return slots
+
+
+def _publish_snapshot(service_id: uuid.UUID, data_version: int, first_day: date, template: ServiceTemplate,
+                      booked: dict[date, list[tuple[int, int]]]) -> None:
+    free_rows, grid_rows = [], []
+    for day, intervals in sorted(booked.items()):
+        windows = _windows_for(template, day)
+        free_rows.append(day_bitmap(windows, intervals, template.buffer))
+        grid_rows.append(start_grid(windows, template.duration, template.buffer))
+    snapshot_store.publish(
+        service_id, data_version, first_day, template.duration, template.buffer,
+        np.stack(free_rows), np.stack(grid_rows),
+    )
+
+
+async def rebuild_availability_snapshot(service_id: uuid.UUID) -> None:
+    """Rebuild one service's snapshot; only one process on the host does so at a time.
+
+    The file locks, the bitmap build and the snapshot write run in worker
+    threads so a rebuild does not stall the event loop.
+    """
+    lock = await asyncio.to_thread(snapshot_store.try_lock_rebuild, service_id)
+    try:
+        if lock is None:
+            return
+        # Read the version before the data so a concurrent change marks this build stale
+        data_version = await asyncio.to_thread(snapshot_store.data_version, service_id)
+        first_day = date.today()
+        last_day = first_day + timedelta(days=settings.AVAILABILITY_SNAPSHOT_DAYS - 1)
+        async with async_session() as session:
+            service = await get_service(session, service_id)
+            if not service:
+                return
+            template = _service_template(service)
+            booked = await _booked_intervals(session, service_id, first_day, last_day, cached=False, capacity=template.capacity)
+
+        await asyncio.to_thread(_publish_snapshot, service_id, data_version, first_day, template, booked)
+    except Exception as e:
+        print(f"❌ Availability snapshot rebuild failed for {service_id}: {e}")
+    finally:
+        if lock is not None:
+            lock.close()
+        _snapshot_rebuilds.pop(service_id, None)
+
+
+async def get_available_slots(db: AsyncSession, service_id: uuid.UUID, target_date: date, cached: bool = True) -> list[dict]:
+    """Open slots for one day. Pass cached=False to read bookings straight from the database."""
+    if cached:
+        slots = _snapshot_slots(service_id, target_date, datetime.now())
+        if slots is not None:
+            return format_slots(slots)
+
+    template = await get_service_template(db, service_id)
+    if not template or not _windows_for(template, target_date):
+        return []
 
-    all_slots = []
-    for avail in available:
-        slots = time_slots(avail.start_time, avail.end_time, service.duration_minutes, service.buffer_minutes)
-        for slot in slots:
-            slot_start = time.fromisoformat(slot["start_time"])
-            slot_end = time.fromisoformat(slot["end_time"])
+    booked = await _booked_intervals(db, service_id, target_date, target_date, cached, template.capacity)
+    slots = _slots_for_day(template, target_date, booked[target_date], datetime.now())
+    return format_slots(slots)
+
+
+async def get_available_slots_range(db: AsyncSession, service: Service, date_from: date, date_to: date) -> dict[date, list[dict]]:
+    """Slots for every day in [date_from, date_to] with at most one bookings query"""
+    now = datetime.now()
+    days = {}
+    day = date_from
+    while day <= date_to:
+        slots = _snapshot_slots(service.id, day, now)
+        if slots is None:
+            break
+        days[day] = format_slots(slots)
+        day += timedelta(days=1)
+    else:
+        return days
+
+    template = _service_template(service)
+    availability_templates.set(service.id, template)
+    booked = await _booked_intervals(db, service.id, date_from, date_to, capacity=template.capacity)
 
-            # Check conflict
-            is_booked = False
-            for booked_start, booked_end in booked_times:
-                if slot_start < booked_end and slot_end > booked_start:
-                    is_booked = True
-                    break
+    return {
+        day: format_slots(_slots_for_day(template, day, intervals, now))
+        for day, intervals in sorted(booked.items())
+    }
 
-            if not is_booked:
-                # Skip past times for today
-                if target_date == date.today():
-                    now = datetime.now().time()
-                    if slot_start <= now:
-                        continue
 
-                all_slots.append(slot)
+async def get_next_available(db: AsyncSession, workspace_id: uuid.UUID, date_from: date, days: int) -> list[dict]:
+    """Earliest open slot per active service within `days` days of date_from, earliest first"""
+    services = [s for s in await get_services(db, workspace_id) if s.is_active]
+    if not services:
+        return []
+
+    date_to = date_from + timedelta(days=days - 1)
+    result = await db.execute(
+        select(Booking.service_id, Booking.booking_date, Booking.start_time, Booking.end_time, func.count())
+        .where(
+            and_(
+                Booking.service_id.in_([s.id for s in services]),
+                Booking.booking_date >= date_from,
+                Booking.booking_date <= date_to,
+                Booking.status.in_(["confirmed", "pending"]),
+            )
+        )
+        .group_by(Booking.service_id, Booking.booking_date, Booking.start_time, Booking.end_time)
+    )
+    capacity = {s.id: s.capacity or 1 for s in services}
+    booked: dict[tuple[uuid.UUID, date], list[tuple[int, int]]] = {}
+    for service_id, booking_date, start, end, count in result.all():
+        if count >= capacity[service_id]:
+            booked.setdefault((service_id, booking_date), []).append((to_minutes(start), to_minutes(end)))
+
+    now = datetime.now()
+    found = []
+    for service in services:
+        template = _service_template(service)
+        # One bitmap row per day that has opening hours, all searched at once
+        row_dates, free_rows, grid_rows = [], [], []
+        for offset in range(days):
+            day = date_from + timedelta(days=offset)
+            windows = _windows_for(template, day)
+            if not windows:
+                continue
+            not_before = to_minutes(now.time()) if day == now.date() else None
+            row_dates.append(day)
+            free_rows.append(day_bitmap(windows, booked.get((service.id, day), []), template.buffer))
+            grid_rows.append(start_grid(windows, template.duration, template.buffer, not_before))
+        if not row_dates:
+            continue
+
+        starts = first_fit(np.stack(free_rows), np.stack(grid_rows), template.duration)
+        hits = np.flatnonzero(starts >= 0)
+        if hits.size:
+            row = hits[0]
+            start = int(starts[row])
+            found.append({
+                "service_id": service.id,
+                "service_name": service.name,
+                "date": row_dates[row],
+                "start_time": minutes_to_iso(start),
+                "end_time": minutes_to_iso(start + template.duration),
+            })
+
+    found.sort(key=lambda f: (f["date"], f["start_time"]))
+    return found
+
+
+async def get_bundle_slots(db: AsyncSession, workspace_id: uuid.UUID, service_ids: list[uuid.UUID], target_date: date) -> list[dict]:
+    """Start times where the services run back to back in the given order.
+
+    Each service contributes its free intervals for the day (its own hours
+    and overrides minus its bookings and buffer); the feasible bundle starts
+    are the intersection of those, found with one sweep per service. Starts
+    are offered on the first service's usual slot grid.
+    """
+    by_id = {s.id: s for s in await get_services(db, workspace_id) if s.is_active}
+    missing = [str(i) for i in service_ids if i not in by_id]
+    if missing:
+        raise ValueError(f"Service not found: {', '.join(missing)}")
+    services = [by_id[i] for i in service_ids]
+
+    free, durations = [], []
+    for service in services:
+        template = _service_template(service)
+        windows = _windows_for(template, target_date)
+        if not windows:
+            return []
+        booked = await _booked_intervals(db, service.id, target_date, target_date, capacity=template.capacity)
+        free.append(free_intervals(windows, booked[target_date], template.buffer))
+        durations.append(template.duration)
+
+    feasible = bundle_starts(free, durations)
+    if not feasible:
+        return []
 
-    return all_slots
+    now = datetime.now()
+    not_before = to_minutes(now.time()) if target_date == now.date() else -1
+    first = _service_template(services[0])
+    step = first.duration + first.buffer
+    starts = set()
+    for lo, hi in feasible:
+        for w_start, w_end in _windows_for(first, target_date):
+            # Grid points w_start + n * step inside [lo, hi) and this window
+            n = max(0, -(-(lo - w_start) // step))
+            for start in range(w_start + n * step, min(hi, w_end), step):
+                if start > not_before:
+                    starts.add(start)
+
+    slots = []
+    for start in sorted(starts):
+        segments = []
+        at = start
+        for service, duration in zip(services, durations):
+            segments.append({
+                "service_id": service.id,
+                "service_name": service.name,
+                "start_time": minutes_to_iso(at),
+                "end_time": minutes_to_iso(at + duration),
+            })
+            at += duration
+        slots.append({"start_time": minutes_to_iso(start), "end_time": minutes_to_iso(at), "segments": segments})
+    return slots
 
 
 # ============================================================
 # BOOKING SERVICE
 # ============================================================
 
-async def create_booking(db: AsyncSession, workspace_id: uuid.UUID, data: dict) -> Booking:
-    service = await get_service(db, data["service_id"])
-    if not service:
-        raise ValueError("Service not found")
+class SlotUnavailableError(Exception):
+    """The requested slot was taken or is outside the service's hours"""
 
-    start = time.fromisoformat(data["start_time"])
-    end = calculate_end_time(start, service.duration_minutes)
 
-    # Create or find contact
-    contact = await create_contact(
-        db, workspace_id,
-        name=data["customer_name"],
-        email=data.get("customer_email"),
-        phone=data.get("customer_phone"),
-        source="booking",
+async def lock_service_day(db: AsyncSession, service_id: uuid.UUID, booking_date: date) -> None:
+    """Serialize bookings for one service-day until the transaction ends.
+
+    Transaction-scoped advisory lock: requests for other services or days never
+    wait on each other, and the lock is released on commit or rollback.
+    """
+    await lock_service_days(db, service_id, [booking_date])
+
+
+async def lock_service_days(db: AsyncSession, service_id: uuid.UUID, dates: list[date]) -> None:
+    """lock_service_day for many days in one statement, always in key order so
+    two overlapping requests cannot deadlock"""
+    keys = sorted({f"booking:{service_id}:{d.isoformat()}" for d in dates})
+    await db.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(hashtextextended(k, 0)) "
+            "FROM (SELECT unnest(CAST(:keys AS text[])) AS k ORDER BY 1) AS s"
+        ),
+        {"keys": keys},
     )
 
-    booking = Booking(
-        workspace_id=workspace_id,
-        service_id=data["service_id"],
-        contact_id=contact.id,
-        booking_date=data["booking_date"],
-        start_time=start,
-        end_time=end,
-        status=BookingStatus.CONFIRMED,
-        customer_name=data["customer_name"],
-        customer_email=data.get("customer_email"),
-        customer_phone=data.get("customer_phone"),
-        notes=data.get("notes"),
-    )
-    db.add(booking)
-    await db.flush()
 
-    # Auto-create form submissions for linked forms
+async def _linked_form_templates(db: AsyncSession, workspace_id: uuid.UUID, service_id: uuid.UUID) -> list[FormTemplate]:
+    """Templates that apply to the service: linked to it, or not linked to any service"""
+    linked_to_service = select(FormTemplateService.form_template_id).where(FormTemplateService.service_id == service_id)
     result = await db.execute(
-        select(FormTemplate).where(FormTemplate.workspace_id == workspace_id)
+        select(FormTemplate)
+        .options(noload(FormTemplate.service_links))
+        .where(
+            and_(
+                FormTemplate.workspace_id == workspace_id,
+                or_(FormTemplate.applies_to_all_services, FormTemplate.id.in_(linked_to_service)),
+            )
+        )
     )
-    templates = result.scalars().all()
+    return result.scalars().all()
 
-    for template in templates:
-        linked = template.linked_service_ids or []
-        if str(data["service_id"]) in [str(s) for s in linked] or not linked:
-            deadline = None
-            if template.deadline_hours:
-                deadline = datetime.combine(data["booking_date"], start) - timedelta(hours=template.deadline_hours)
 
-            submission = FormSubmission(
-                form_template_id=template.id,
-                booking_id=booking.id,
-                contact_id=contact.id,
-                status=FormSubmissionStatus.PENDING,
-                deadline=deadline,
-            )
-            db.add(submission)
+async def create_booking(db: AsyncSession, workspace_id: uuid.UUID, service: Service, contact: Contact, data: dict,
+                         hold: Optional[Booking] = None) -> Booking:
+    """Validate the slot and write the booking with everything it triggers.
 
-    await db.flush()
+    Takes the service and contact the caller already loaded. Reads are limited
+    to the advisory lock, the day's bookings, the applicable form templates and
+    the inventory items this service consumes; the booking, form submissions,
+    inventory changes, alerts and automation logs then go out in one flush.
+    A contact created with flush=False is written in that same flush.
 
-    # Deduct inventory
-    await deduct_inventory_for_booking(db, workspace_id, data["service_id"])
+    With `hold` (a pending waitlist hold) that booking is confirmed in place
+    instead of inserting a new one. It must still be pending and its slot must
+    still be free of every other booking.
+    """
+    start = time.fromisoformat(data["start_time"])
+    end = calculate_end_time(start, service.duration_minutes)
+    booking_date = data["booking_date"]
+
+    with db.no_autoflush:
+        # Check the slot while holding the service-day lock so two requests for
+        # the same slot cannot both see it free
+        await lock_service_day(db, service.id, booking_date)
+        if hold is not None:
+            # Staff may have cancelled the hold (and re-offered the slot) meanwhile
+            held = await db.execute(select(Booking.status).where(Booking.id == hold.id).with_for_update())
+            if held.scalar_one_or_none() != BookingStatus.PENDING:
+                raise SlotUnavailableError("This slot is no longer held")
+        template = _service_template(service)
+        booked = await _booked_intervals(
+            db, service.id, booking_date, booking_date, cached=False, capacity=template.capacity,
+            exclude=hold.id if hold is not None else None,
+        )
+        slots = _slots_for_day(template, booking_date, booked[booking_date], datetime.now())
+        if to_minutes(start) not in [s for s, _ in slots]:
+            raise SlotUnavailableError("Selected time slot is no longer available")
 
-    # Log automation
-    await log_automation(db, workspace_id, "booking_created", "send_confirmation",
-                         AutomationStatus.SUCCESS,
-                         {"booking_id": str(booking.id), "contact_id": str(contact.id)})
+        forms = await _linked_form_templates(db, workspace_id, service.id)
+        inventory_rows = await deduct_inventory_for_booking(db, workspace_id, service.id, flush=False)
 
+    if hold is None:
+        booking = Booking(
+            id=uuid.uuid4(),
+            workspace_id=workspace_id,
+            service_id=service.id,
+            contact_id=contact.id,
+            booking_date=booking_date,
+            start_time=start,
+            end_time=end,
+            status=BookingStatus.CONFIRMED,
+            customer_name=data["customer_name"],
+            customer_email=data.get("customer_email"),
+            customer_phone=data.get("customer_phone"),
+            notes=data.get("notes"),
+        )
+        pending: list = [booking]
+    else:
+        booking = hold
+        booking.status = BookingStatus.CONFIRMED
+        booking.notes = data.get("notes")
+        booking.updated_at = datetime.utcnow()
+        pending = []
+
+    # Form submissions for linked forms
+    for form in forms:
+        deadline = None
+        if form.deadline_hours:
+            deadline = datetime.combine(booking_date, start) - timedelta(hours=form.deadline_hours)
+        pending.append(FormSubmission(
+            form_template_id=form.id,
+            booking_id=booking.id,
+            contact_id=contact.id,
+            status=FormSubmissionStatus.PENDING,
+            deadline=deadline,
+        ))
+
+    pending.extend(inventory_rows)
+    pending.append(AutomationLog(
+        workspace_id=workspace_id,
+        event_type="booking_created",
+        action_taken="send_confirmation",
+        status=AutomationStatus.SUCCESS,
+        details={"booking_id": str(booking.id), "contact_id": str(contact.id)},
+    ))
+
+    db.add_all(pending)
+    await db.flush()
+    invalidate_availability(db, booking.service_id, booking.booking_date)
     return booking
 
 
-async def get_bookings(db: AsyncSession, workspace_id: uuid.UUID, status_filter: str = None, date_filter: date = None) -> list:
-    query = select(Booking).options(selectinload(Booking.service)).where(Booking.workspace_id == workspace_id)
+def series_dates(first: date, interval_weeks: int = 1, count: Optional[int] = None, until: Optional[date] = None) -> list[date]:
+    """Occurrence dates of a weekly series.
+
+    A series longer than BOOKING_SERIES_MAX_OCCURRENCES, by count or by until,
+    is rejected rather than cut short, so a caller never believes occurrences
+    were booked that were not.
+    """
+    if interval_weeks < 1:
+        raise ValueError("interval_weeks must be at least 1")
+    if count is None and until is None:
+        raise ValueError("Either count or until is required")
+    max_occurrences = settings.BOOKING_SERIES_MAX_OCCURRENCES
+    if count is not None and count > max_occurrences:
+        raise ValueError(f"A series is limited to {max_occurrences} occurrences")
+    limit = count or max_occurrences + 1
+    dates = []
+    day = first
+    while len(dates) < limit and (until is None or day <= until):
+        dates.append(day)
+        day += timedelta(weeks=interval_weeks)
+    if len(dates) > max_occurrences:
+        raise ValueError(f"A series is limited to {max_occurrences} occurrences; choose an earlier end date")
+    return dates
+
+
+async def create_booking_series(db: AsyncSession, workspace_id: uuid.UUID, service: Service, contact: Contact, data: dict) -> tuple[BookingSeries, list[Booking], list[dict]]:
+    """Book every occurrence of a weekly series that is free.
+
+    All occurrence days are locked in one statement, existing bookings come
+    from one range query, and the free/conflict test for every occurrence is
+    a single bitmap pass. Returns the series, the created bookings and the
+    occurrences that could not be booked with the reason.
+    """
+    start = time.fromisoformat(data["start_time"])
+    end = calculate_end_time(start, service.duration_minutes)
+    dates = series_dates(data["booking_date"], data.get("interval_weeks", 1), data.get("count"), data.get("until"))
+    if not dates:
+        raise ValueError("The series has no occurrences")
+
+    start_minute = to_minutes(start)
+    duration = service.duration_minutes
+    now = datetime.now()
+
+    with db.no_autoflush:
+        await lock_service_days(db, service.id, dates)
+        template = _service_template(service)
+        booked = await _booked_intervals(db, service.id, dates[0], dates[-1], cached=False, capacity=template.capacity)
+
+        free_rows, grid_rows = [], []
+        for day in dates:
+            windows = _windows_for(template, day)
+            not_before = to_minutes(now.time()) if day == now.date() else None
+            free_rows.append(day_bitmap(windows, booked[day], template.buffer))
+            grid_rows.append(start_grid(windows, duration, template.buffer, not_before))
+        free, grid = np.stack(free_rows), np.stack(grid_rows)
+        on_grid = grid[:, start_minute]
+        if 0 < duration <= MINUTES_PER_DAY - start_minute:
+            open_ = fits(free, grid, duration)[:, start_minute]
+        else:
+            open_ = np.zeros(len(dates), dtype=bool)
 
-    if status_filter:
-        query = query.where(Booking.status == status_filter)
-    if date_filter:
-        query = query.where(Booking.booking_date == date_filter)
+        free_dates = [day for day, ok in zip(dates, open_) if ok]
+        forms = await _linked_form_templates(db, workspace_id, service.id) if free_dates else []
+        inventory_rows = await deduct_inventory_for_booking(
+            db, workspace_id, service.id, flush=False, bookings=len(free_dates)
+        ) if free_dates else []
 
-    query = query.order_by(Booking.booking_date.desc(), Booking.start_time.desc())
-    result = await db.execute(query)
-    bookings = result.scalars().all()
+    failed = [
+        {"booking_date": day, "reason": "conflict" if slot else "unavailable"}
+        for day, ok, slot in zip(dates, open_, on_grid) if not ok
+    ]
 
-    booking_list = []
-    for b in bookings:
-        # Check form status
-        forms_result = await db.execute(
-            select(FormSubmission).where(FormSubmission.booking_id == b.id)
+    series = BookingSeries(
+        id=uuid.uuid4(),
+        workspace_id=workspace_id,
+        service_id=service.id,
+        contact_id=contact.id,
+        first_date=dates[0],
+        start_time=start,
+        interval_weeks=data.get("interval_weeks", 1),
+        occurrences=len(dates),
+        until=data.get("until"),
+    )
+    pending: list = [series]
+    bookings = []
+    for day in free_dates:
+        booking = Booking(
+            id=uuid.uuid4(),
+            workspace_id=workspace_id,
+            service_id=service.id,
+            contact_id=contact.id,
+            series_id=series.id,
+            booking_date=day,
+            start_time=start,
+            end_time=end,
+            status=BookingStatus.CONFIRMED,
+            customer_name=data["customer_name"],
+            customer_email=data.get("customer_email"),
+            customer_phone=data.get("customer_phone"),
+            notes=data.get("notes"),
         )
-        form_subs = forms_result.scalars().all()
-        form_status = None
-        if form_subs:
-            if all(f.status == "completed" for f in form_subs):
-                form_status = "completed"
-            elif any(f.status == "overdue" for f in form_subs):
-                form_status = "overdue"
-            else:
-                form_status = "pending"
-
-        booking_list.append({
-            "id": b.id,
-            "workspace_id": b.workspace_id,
-            "service_id": b.service_id,
-            "contact_id": b.contact_id,
-            "booking_date": b.booking_date,
-            "start_time": b.start_time,
-            "end_time": b.end_time,
-            "status": b.status,
-            "notes": b.notes,
-            "customer_name": b.customer_name,
-            "customer_email": b.customer_email,
-            "customer_phone": b.customer_phone,
-            "created_at": b.created_at,
-            "updated_at": b.updated_at,
-            "service_name": b.service.name if b.service else None,
-            "service_duration": b.service.duration_minutes if b.service else None,
-            "form_status": form_status,
-        })
+        bookings.append(booking)
+        pending.append(booking)
+        for form in forms:
+            deadline = None
+            if form.deadline_hours:
+                deadline = datetime.combine(day, start) - timedelta(hours=form.deadline_hours)
+            pending.append(FormSubmission(
+                form_template_id=form.id,
+                booking_id=booking.id,
+                contact_id=contact.id,
+                status=FormSubmissionStatus.PENDING,
+                deadline=deadline,
+            ))
 
-    return booking_list
+    if not bookings:
+        return series, [], failed
 
+    pending.extend(inventory_rows)
+    pending.append(AutomationLog(
+        workspace_id=workspace_id,
+        event_type="booking_series_created",
+        action_taken="send_confirmation",
+        status=AutomationStatus.SUCCESS,
+        details={
+            "series_id": str(series.id),
+            "contact_id": str(contact.id),
+            "booked": len(bookings),
+            "failed": len(failed),
+        },
+    ))
 
-async def get_booking(db: AsyncSession, booking_id: uuid.UUID) -> Optional[dict]:
-    result = await db.execute(
-        select(Booking).options(selectinload(Booking.service)).where(Booking.id == booking_id)
+    db.add_all(pending)
+    await db.flush()
+    for day in free_dates:
+        invalidate_availability(db, service.id, day)
+    return series, bookings, failed
+
+
+def _form_status_column():
+    """Per-booking form status: completed when every submission is, else overdue if any is.
+
+    Correlated on booking_id, so it only reads the submissions of the rows
+    being returned (via ix_form_submissions_booking). NULL without forms.
+    """
+    return (
+        select(
+            case(
+                (func.count() == 0, None),
+                (func.bool_and(FormSubmission.status == FormSubmissionStatus.COMPLETED), "completed"),
+                (func.bool_or(FormSubmission.status == FormSubmissionStatus.OVERDUE), "overdue"),
+                else_="pending",
+            )
+        )
+        .where(FormSubmission.booking_id == Booking.id)
+        .correlate(Booking)
+        .scalar_subquery()
+        .label("form_status")
     )
-    b = result.scalar_one_or_none()
-    if not b:
-        return None
 
-    forms_result = await db.execute(
-        select(FormSubmission).where(FormSubmission.booking_id == b.id)
-    )
-    form_subs = forms_result.scalars().all()
-    form_status = None
-    if form_subs:
-        if all(f.status == "completed" for f in form_subs):
-            form_status = "completed"
-        elif any(f.status == "overdue" for f in form_subs):
-            form_status = "overdue"
-        else:
-            form_status = "pending"
 
+def _booking_dict(b: Booking, form_status: Optional[str]) -> dict:
     return {
         "id": b.id,
         "workspace_id": b.workspace_id,
@@ -655,28 +1327,344 @@ async def get_booking(db: AsyncSession, booking_id: uuid.UUID) -> Optional[dict]
     }
 
 
+async def get_bookings(
+    db: AsyncSession,
+    workspace_id: uuid.UUID,
+    status_filter: str = None,
+    date_filter: date = None,
+    date_from: date = None,
+    date_to: date = None,
+    service_id: uuid.UUID = None,
+    contact_id: uuid.UUID = None,
+    cursor: str = None,
+    limit: int = None,
+) -> tuple[list, Optional[str]]:
+    """One page of bookings, newest first, plus the cursor for the next page.
+
+    Pages are keyed on (booking_date, start_time, id) so each page is an index
+    range scan regardless of how deep the client has paged.
+    """
+    limit = min(limit or settings.BOOKINGS_PAGE_SIZE, settings.BOOKINGS_MAX_PAGE_SIZE)
+    query = (
+        select(Booking, _form_status_column())
+        .options(selectinload(Booking.service))
+        .where(Booking.workspace_id == workspace_id)
+    )
+
+    if status_filter:
+        query = query.where(Booking.status == status_filter)
+    if date_filter:
+        query = query.where(Booking.booking_date == date_filter)
+    if date_from:
+        query = query.where(Booking.booking_date >= date_from)
+    if date_to:
+        query = query.where(Booking.booking_date <= date_to)
+    if service_id:
+        query = query.where(Booking.service_id == service_id)
+    if contact_id:
+        query = query.where(Booking.contact_id == contact_id)
+    if cursor:
+        try:
+            last_date, last_start, last_id = decode_cursor(cursor)
+            after = (date.fromisoformat(last_date), time.fromisoformat(last_start), uuid.UUID(last_id))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        query = query.where(tuple_(Booking.booking_date, Booking.start_time, Booking.id) < after)
+
+    query = query.order_by(
+        Booking.booking_date.desc(), Booking.start_time.desc(), Booking.id.desc()
+    ).limit(limit + 1)
+    result = await db.execute(query)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.booking_date, last.start_time, last.id)
+    return [_booking_dict(b, status) for b, status in rows], next_cursor
+
+
+async def get_booking_calendar(db: AsyncSession, workspace_id: uuid.UUID, date_from: date, date_to: date, granularity: str = "day") -> list[dict]:
+    """Booking counts per day (or hour) broken down by status and service, from one GROUP BY"""
+    if granularity not in ("day", "hour"):
+        raise ValueError(f"Invalid granularity: {granularity}")
+
+    hour = func.extract("hour", Booking.start_time).label("hour") if granularity == "hour" else None
+    keys = [Booking.booking_date] + ([hour] if hour is not None else []) + [Booking.status, Booking.service_id]
+    result = await db.execute(
+        select(*keys, func.count())
+        .where(
+            and_(
+                Booking.workspace_id == workspace_id,
+                Booking.booking_date >= date_from,
+                Booking.booking_date <= date_to,
+            )
+        )
+        .group_by(*keys)
+    )
+
+    buckets: dict[str, dict] = {}
+    for row in result.all():
+        if hour is not None:
+            booking_date, booking_hour, status, service_id, count = row
+            start = f"{booking_date.isoformat()}T{int(booking_hour):02d}:00"
+        else:
+            booking_date, status, service_id, count = row
+            start = booking_date.isoformat()
+        bucket = buckets.setdefault(start, {"start": start, "total": 0, "by_status": {}, "by_service": {}})
+        status = status.value if hasattr(status, "value") else status
+        bucket["total"] += count
+        bucket["by_status"][status] = bucket["by_status"].get(status, 0) + count
+        bucket["by_service"][str(service_id)] = bucket["by_service"].get(str(service_id), 0) + count
+
+    return [buckets[k] for k in sorted(buckets)]
+
+
+async def get_booking(db: AsyncSession, booking_id: uuid.UUID) -> Optional[dict]:
+    result = await db.execute(
+        select(Booking, _form_status_column())
+        .options(selectinload(Booking.service))
+        .where(Booking.id == booking_id)
+    )
+    row = result.first()
+    if not row:
+        return None
+    return _booking_dict(row[0], row[1])
+
+
+def record_cancellation(db: AsyncSession, service_id: uuid.UUID, booking_date: date) -> None:
+    """Note a freed slot; the waitlist matcher picks these up after commit"""
+    db.sync_session.info.setdefault("cancelled_slots", set()).add((service_id, booking_date))
+
+
 async def update_booking_status(db: AsyncSession, booking_id: uuid.UUID, status: str) -> Optional[Booking]:
     result = await db.execute(select(Booking).where(Booking.id == booking_id))
     booking = result.scalar_one_or_none()
     if not booking:
         return None
+    was_active = booking.status in (BookingStatus.CONFIRMED, BookingStatus.PENDING)
     booking.status = status
     booking.updated_at = datetime.utcnow()
     await db.flush()
+    invalidate_availability(db, booking.service_id, booking.booking_date)
+    if was_active and status == BookingStatus.CANCELLED:
+        record_cancellation(db, booking.service_id, booking.booking_date)
     return booking
 
 
+async def update_booking_statuses(db: AsyncSession, workspace_id: uuid.UUID, updates: list[dict]) -> tuple[list[uuid.UUID], list[uuid.UUID]]:
+    """Apply many (id, status) pairs with one UPDATE ... FROM (VALUES ...).
+
+    Only bookings in the workspace are touched. Returns the updated ids and the
+    ids that were not found; side effects are written as one batch, and only
+    for rows whose status actually changed.
+    """
+    valid = [s.value for s in BookingStatus]
+    requested: dict[uuid.UUID, str] = {}
+    for u in updates:
+        if u["status"] not in valid:
+            raise ValueError(f"Invalid status: {u['status']}")
+        requested[u["id"]] = u["status"]  # last one wins for repeated ids
+    if not requested:
+        return [], []
+
+    bookings = Booking.__table__
+    v = values(
+        column("id", UUID(as_uuid=True)),
+        column("status", bookings.c.status.type),
+        name="v",
+    ).data([(booking_id, BookingStatus(status)) for booking_id, status in requested.items()])
+
+    # RETURNING only sees new values, so the previous status comes from a
+    # locked read of the same rows in the same statement
+    previous = (
+        select(bookings.c.id, bookings.c.status.label("old_status"))
+        .where(and_(bookings.c.id.in_(list(requested)), bookings.c.workspace_id == workspace_id))
+        .with_for_update()
+        .cte("previous")
+    )
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(bookings)
+        .where(and_(bookings.c.id == v.c.id, bookings.c.id == previous.c.id))
+        .values(status=v.c.status, updated_at=now)
+        .returning(bookings.c.id, bookings.c.service_id, bookings.c.booking_date, bookings.c.contact_id, previous.c.old_status)
+    )
+    matched = result.all()
+    rows = [r for r in matched if r.old_status != requested[r.id]]
+
+    for service_id, booking_date in {(r.service_id, r.booking_date) for r in rows}:
+        invalidate_availability(db, service_id, booking_date)
+    active = (BookingStatus.CONFIRMED, BookingStatus.PENDING)
+    for r in rows:
+        if r.old_status in active and requested[r.id] == BookingStatus.CANCELLED:
+            record_cancellation(db, r.service_id, r.booking_date)
+
+    if rows:
+        await db.execute(insert(AutomationLog), [
+            {
+                "workspace_id": workspace_id,
+                "event_type": "booking_status_changed",
+                "action_taken": f"mark_{requested[r.id]}",
+                "status": AutomationStatus.SUCCESS,
+                "details": {"booking_id": str(r.id), "status": requested[r.id]},
+                "related_contact_id": r.contact_id,
+                "related_booking_id": r.id,
+                "created_at": now,
+            }
+            for r in rows
+        ])
+
+    updated = {r.id for r in matched}
+    return [r.id for r in matched], [i for i in requested if i not in updated]
+
+
+# ============================================================
+# CALENDAR FEED SERVICE
+# ============================================================
+
+async def create_calendar_feed(db: AsyncSession, workspace_id: uuid.UUID, name: str, service_id: Optional[uuid.UUID] = None) -> CalendarFeed:
+    feed = CalendarFeed(
+        workspace_id=workspace_id,
+        service_id=service_id,
+        name=name,
+        token=secrets.token_urlsafe(32),
+    )
+    db.add(feed)
+    await db.flush()
+    return feed
+
+
+async def get_calendar_feeds(db: AsyncSession, workspace_id: uuid.UUID) -> list[CalendarFeed]:
+    result = await db.execute(
+        select(CalendarFeed)
+        .where(CalendarFeed.workspace_id == workspace_id)
+        .order_by(CalendarFeed.created_at.desc())
+    )
+    return result.scalars().all()
+
+
+async def delete_calendar_feed(db: AsyncSession, workspace_id: uuid.UUID, feed_id: uuid.UUID) -> bool:
+    result = await db.execute(
+        select(CalendarFeed).where(and_(CalendarFeed.id == feed_id, CalendarFeed.workspace_id == workspace_id))
+    )
+    feed = result.scalar_one_or_none()
+    if not feed:
+        return False
+    await db.delete(feed)
+    await db.flush()
+    return True
+
+
+async def get_calendar_feed_by_token(db: AsyncSession, token: str) -> Optional[tuple[CalendarFeed, Workspace]]:
+    result = await db.execute(
+        select(CalendarFeed, Workspace)
+        .join(Workspace, Workspace.id == CalendarFeed.workspace_id)
+        .where(CalendarFeed.token == token)
+    )
+    return result.first()
+
+
+def calendar_feed_window(today: Optional[date] = None) -> tuple[date, date]:
+    today = today or date.today()
+    return (
+        today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS),
+        today + timedelta(days=settings.CALENDAR_FEED_FUTURE_DAYS),
+    )
+
+
+def _calendar_feed_filter(feed: CalendarFeed, date_from: date, date_to: date):
+    conditions = [
+        Booking.workspace_id == feed.workspace_id,
+        Booking.booking_date >= date_from,
+        Booking.booking_date <= date_to,
+    ]
+    if feed.service_id:
+        conditions.append(Booking.service_id == feed.service_id)
+    return and_(*conditions)
+
+
+async def calendar_feed_etag(db: AsyncSession, feed: CalendarFeed, workspace: Workspace, date_from: date, date_to: date) -> str:
+    """Strong validator for the feed body.
+
+    Cancelled bookings stay in the feed (as STATUS:CANCELLED), so every change
+    to an included booking moves max(updated_at) or the row count. The body
+    also carries the service names (SUMMARY), the feed name and the workspace
+    timezone (TZID), so a service edit or timezone change moves it too.
+    """
+    services_updated = select(func.max(Service.updated_at)).where(Service.workspace_id == feed.workspace_id)
+    if feed.service_id:
+        services_updated = services_updated.where(Service.id == feed.service_id)
+    result = await db.execute(
+        select(func.max(Booking.updated_at), func.count(), services_updated.scalar_subquery())
+        .where(_calendar_feed_filter(feed, date_from, date_to))
+    )
+    last_updated, count, service_updated = result.one()
+    raw = ":".join([
+        str(feed.id), feed.name, workspace.timezone, str(date_from), str(date_to),
+        last_updated.isoformat() if last_updated else "", str(count),
+        service_updated.isoformat() if service_updated else "",
+    ])
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+async def stream_calendar_feed(feed: CalendarFeed, workspace: Workspace, date_from: date, date_to: date):
+    """Yield the ICS body chunk by chunk from a server-side cursor.
+
+    Opens its own session: the request session is closed before a streaming
+    response body is sent.
+    """
+    yield ics.calendar_header(feed.name, workspace.timezone)
+    async with async_session() as session:
+        result = await session.stream(
+            select(
+                Booking.id, Booking.booking_date, Booking.start_time, Booking.end_time, Booking.status,
+                Booking.customer_name, Booking.notes, Booking.updated_at, Service.name,
+            )
+            .outerjoin(Service, Service.id == Booking.service_id)
+            .where(_calendar_feed_filter(feed, date_from, date_to))
+            .order_by(Booking.booking_date, Booking.start_time)
+            .execution_options(yield_per=500)
+        )
+        async for partition in result.partitions():
+            yield "".join(
+                ics.event(
+                    uid=f"{booking_id}@careops",
+                    day=booking_date,
+                    start=start,
+                    end=end,
+                    summary=f"{service_name or 'Booking'} - {customer_name}",
+                    stamp=updated_at,
+                    timezone=workspace.timezone,
+                    description=notes,
+                    cancelled=status == BookingStatus.CANCELLED,
+                )
+                for booking_id, booking_date, start, end, status, customer_name, notes, updated_at, service_name in partition
+            )
+    yield ics.calendar_footer()
+
+
 # ============================================================
 # FORM SERVICE
 # ============================================================
 
 async def create_form_template(db: AsyncSession, workspace_id: uuid.UUID, data: dict) -> FormTemplate:
+    service_ids = list(dict.fromkeys(uuid.UUID(str(s)) for s in data.get("linked_service_ids") or []))
+    if service_ids:
+        found = (await db.execute(
+            select(Service.id).where(and_(Service.id.in_(service_ids), Service.workspace_id == workspace_id))
+        )).scalars().all()
+        if len(found) != len(service_ids):
+            raise ValueError("linked_service_ids contains unknown services")
+
     template = FormTemplate(
         workspace_id=workspace_id,
         name=data["name"],
         description=data.get("description"),
         fields=[f if isinstance(f, dict) else f.model_dump() for f in data["fields"]],
-        linked_service_ids=[str(s) for s in data.get("linked_service_ids", [])] if data.get("linked_service_ids") else [],
+        applies_to_all_services=not service_ids,
+        service_links=[FormTemplateService(service_id=s) for s in service_ids],
         deadline_hours=data.get("deadline_hours", 24),
     )
     db.add(template)
@@ -691,78 +1679,126 @@ async def get_form_templates(db: AsyncSession, workspace_id: uuid.UUID) -> list[
     return result.scalars().all()
 
 
-async def get_form_submissions(db: AsyncSession, workspace_id: uuid.UUID) -> list[dict]:
-    result = await db.execute(
-        select(FormSubmission)
-        .join(FormTemplate)
-        .join(Booking)
-        .join(Contact)
+async def get_form_submissions(
+    db: AsyncSession,
+    workspace_id: uuid.UUID,
+    status_filter: str = None,
+    form_template_id: uuid.UUID = None,
+    booking_id: uuid.UUID = None,
+    date_from: date = None,
+    date_to: date = None,
+    cursor: str = None,
+    limit: int = None,
+) -> tuple[list[dict], Optional[str]]:
+    """One page of submissions, newest first, plus the cursor for the next page.
+
+    Template, contact and booking fields come from the same joined query as
+    plain columns, so a page is a single round trip. date_from/date_to filter
+    on the booking date.
+    """
+    limit = min(limit or settings.FORM_SUBMISSIONS_PAGE_SIZE, settings.FORM_SUBMISSIONS_MAX_PAGE_SIZE)
+    query = (
+        select(
+            FormSubmission.id,
+            FormSubmission.form_template_id,
+            FormSubmission.booking_id,
+            FormSubmission.contact_id,
+            FormSubmission.token,
+            FormSubmission.status,
+            FormSubmission.data,
+            FormSubmission.submitted_at,
+            FormSubmission.deadline,
+            FormSubmission.created_at,
+            FormTemplate.name.label("form_name"),
+            Contact.name.label("contact_name"),
+            Booking.booking_date,
+        )
+        .join(FormTemplate, FormTemplate.id == FormSubmission.form_template_id)
+        .join(Booking, Booking.id == FormSubmission.booking_id)
+        .join(Contact, Contact.id == FormSubmission.contact_id)
         .where(FormTemplate.workspace_id == workspace_id)
-        .order_by(FormSubmission.created_at.desc())
-    )
-    submissions = result.scalars().all()
-
-    sub_list = []
-    for s in submissions:
-        # Get related data
-        template = await db.execute(select(FormTemplate).where(FormTemplate.id == s.form_template_id))
-        tmpl = template.scalar_one_or_none()
-        contact = await db.execute(select(Contact).where(Contact.id == s.contact_id))
-        cont = contact.scalar_one_or_none()
-        booking = await db.execute(select(Booking).where(Booking.id == s.booking_id))
-        bk = booking.scalar_one_or_none()
-
-        sub_list.append({
-            "id": s.id,
-            "form_template_id": s.form_template_id,
-            "booking_id": s.booking_id,
-            "contact_id": s.contact_id,
-            "token": s.token,
-            "status": s.status,
-            "data": s.data,
-            "submitted_at": s.submitted_at,
-            "deadline": s.deadline,
-            "created_at": s.created_at,
-            "form_name": tmpl.name if tmpl else None,
-            "contact_name": cont.name if cont else None,
-            "booking_date": str(bk.booking_date) if bk else None,
-        })
+    )
 
-    return sub_list
+    if status_filter:
+        query = query.where(FormSubmission.status == status_filter)
+    if form_template_id:
+        query = query.where(FormSubmission.form_template_id == form_template_id)
+    if booking_id:
+        query = query.where(FormSubmission.booking_id == booking_id)
+    if date_from:
+        query = query.where(Booking.booking_date >= date_from)
+    if date_to:
+        query = query.where(Booking.booking_date <= date_to)
+    if cursor:
+        try:
+            last_created, last_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(last_created), uuid.UUID(last_id))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        query = query.where(tuple_(FormSubmission.created_at, FormSubmission.id) < after)
+
+    query = query.order_by(FormSubmission.created_at.desc(), FormSubmission.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return [
+        {**row, "booking_date": str(row["booking_date"]) if row["booking_date"] else None}
+        for row in rows
+    ], next_cursor
+
+
+# Name, description and fields of a template, keyed by (template_id, updated_at)
+# so an edited template is simply a new key
+form_schemas = LRUCache(maxsize=settings.FORM_SCHEMA_CACHE_SIZE)
+
+
+async def _form_schema(db: AsyncSession, template_id: Optional[uuid.UUID], updated_at: Optional[datetime]) -> dict:
+    if template_id is None:
+        return {"form_name": "Form", "form_description": None, "fields": []}
+    key = (template_id, updated_at)
+    schema = form_schemas.get(key)
+    if schema is None:
+        row = (await db.execute(
+            select(FormTemplate.name, FormTemplate.description, FormTemplate.fields)
+            .where(FormTemplate.id == template_id)
+        )).one()
+        schema = {"form_name": row.name, "form_description": row.description, "fields": row.fields or []}
+        form_schemas.set(key, schema)
+    return schema
 
 
 async def get_public_form(db: AsyncSession, token: str) -> Optional[dict]:
+    """Public form page data from one token lookup; the template schema is cached"""
     try:
         token_uuid = uuid.UUID(token)
     except ValueError:
         return None
 
     result = await db.execute(
-        select(FormSubmission).where(FormSubmission.token == token_uuid)
+        select(
+            FormSubmission.status,
+            FormTemplate.id.label("template_id"),
+            FormTemplate.updated_at.label("template_updated_at"),
+            Booking.booking_date,
+            Service.name.label("service_name"),
+        )
+        .outerjoin(FormTemplate, FormTemplate.id == FormSubmission.form_template_id)
+        .outerjoin(Booking, Booking.id == FormSubmission.booking_id)
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .where(FormSubmission.token == token_uuid)
     )
-    submission = result.scalar_one_or_none()
-    if not submission:
+    row = result.one_or_none()
+    if not row:
         return None
 
-    template = await db.execute(select(FormTemplate).where(FormTemplate.id == submission.form_template_id))
-    tmpl = template.scalar_one_or_none()
-
-    booking = await db.execute(select(Booking).where(Booking.id == submission.booking_id))
-    bk = booking.scalar_one_or_none()
-
-    service_name = None
-    if bk:
-        svc = await db.execute(select(Service).where(Service.id == bk.service_id))
-        s = svc.scalar_one_or_none()
-        service_name = s.name if s else None
-
     return {
-        "form_name": tmpl.name if tmpl else "Form",
-        "form_description": tmpl.description if tmpl else None,
-        "fields": tmpl.fields if tmpl else [],
-        "booking_date": str(bk.booking_date) if bk else None,
-        "service_name": service_name,
-        "status": submission.status,
+        **await _form_schema(db, row.template_id, row.template_updated_at),
+        "booking_date": str(row.booking_date) if row.booking_date else None,
+        "service_name": row.service_name,
+        "status": row.status,
     }
 
 
@@ -845,34 +1881,54 @@ async def update_inventory_item(db: AsyncSession, item_id: uuid.UUID, data: dict
     return item
 
 
-async def deduct_inventory_for_booking(db: AsyncSession, workspace_id: uuid.UUID, service_id: uuid.UUID):
+async def deduct_inventory_for_booking(db: AsyncSession, workspace_id: uuid.UUID, service_id: uuid.UUID, flush: bool = True, bookings: int = 1) -> list:
+    """Deduct per-booking usage (times `bookings`) from the items this service consumes.
+
+    Returns the alerts and automation logs raised for low stock. With
+    flush=False they are not added to the session, so the caller can write
+    them together with its own rows.
+    """
     result = await db.execute(
-        select(InventoryItem).where(InventoryItem.workspace_id == workspace_id)
+        select(InventoryItem).where(
+            and_(
+                InventoryItem.workspace_id == workspace_id,
+                cast(InventoryItem.usage_per_booking, JSONB).has_key(str(service_id)),
+            )
+        )
     )
     items = result.scalars().all()
 
+    created = []
     for item in items:
         usage = item.usage_per_booking or {}
-        qty = usage.get(str(service_id), 0)
+        qty = usage.get(str(service_id), 0) * bookings
         if qty > 0:
             item.current_quantity = max(0, item.current_quantity - qty)
             item.updated_at = datetime.utcnow()
 
             if item.current_quantity <= item.low_threshold:
                 severity = AlertSeverity.CRITICAL if item.current_quantity == 0 else AlertSeverity.WARNING
-                await create_alert(
-                    db, workspace_id,
-                    AlertType.INVENTORY_LOW,
-                    f"Low stock: {item.name}",
-                    f"{item.name} has {item.current_quantity} {item.unit} remaining",
-                    severity,
-                    f"/dashboard/inventory",
-                    item.id,
-                )
-                await log_automation(db, workspace_id, "inventory_low", "create_alert",
-                                     AutomationStatus.SUCCESS, {"item": item.name, "qty": item.current_quantity})
-
-    await db.flush()
+                created.append(Alert(
+                    workspace_id=workspace_id,
+                    type=AlertType.INVENTORY_LOW,
+                    title=f"Low stock: {item.name}",
+                    description=f"{item.name} has {item.current_quantity} {item.unit} remaining",
+                    severity=severity,
+                    link_to="/dashboard/inventory",
+                    related_id=item.id,
+                ))
+                created.append(AutomationLog(
+                    workspace_id=workspace_id,
+                    event_type="inventory_low",
+                    action_taken="create_alert",
+                    status=AutomationStatus.SUCCESS,
+                    details={"item": item.name, "qty": item.current_quantity},
+                ))
+
+    if flush:
+        db.add_all(created)
+        await db.flush()
+    return created
 
 
 # ============================================================
@@ -1158,6 +2214,91 @@ async def get_dashboard_data(db: AsyncSession, workspace_id: uuid.UUID) -> dict:
     }
 
 
+# ============================================================
+# IDEMPOTENCY SERVICE
+# ============================================================
+
+class IdempotencyMismatchError(Exception):
+    """The Idempotency-Key was already used for a different request body"""
+
+
+def idempotency_request_hash(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def begin_idempotent(db: AsyncSession, scope: str, key: str, request_hash: str) -> Optional[IdempotencyKey]:
+    """Claim an idempotency key for this transaction; return the stored response if it was already used.
+
+    The transaction-scoped advisory lock makes a concurrent duplicate wait
+    here until the first request commits (and then see its stored response)
+    or rolls back (and then run normally).
+    """
+    lock_key = func.hashtextextended(f"idempotency:{scope}:{key}", 0)
+    await db.execute(select(func.pg_advisory_xact_lock(lock_key)))
+
+    result = await db.execute(
+        select(IdempotencyKey).where(
+            and_(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at > datetime.utcnow(),
+            )
+        )
+    )
+    stored = result.scalar_one_or_none()
+    if stored and stored.request_hash != request_hash:
+        raise IdempotencyMismatchError("Idempotency-Key was already used with a different request")
+    return stored
+
+
+async def save_idempotent(db: AsyncSession, scope: str, key: str, request_hash: str, status_code: int, body: dict) -> None:
+    """Store the response in the same transaction as the work it describes"""
+    now = datetime.utcnow()
+    await db.execute(
+        pg_insert(IdempotencyKey)
+        .values(
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response_body=body,
+            created_at=now,
+            expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+        )
+        .on_conflict_do_update(
+            index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+            set_={
+                "request_hash": request_hash,
+                "status_code": status_code,
+                "response_body": body,
+                "created_at": now,
+                "expires_at": now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+            },
+        )
+    )
+
+
+async def purge_expired_idempotency_keys(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+    )
+    return result.rowcount
+
+
+async def run_idempotency_cleanup() -> None:
+    """Background loop: drop stored responses past their TTL"""
+    while True:
+        try:
+            async with async_session() as session:
+                purged = await purge_expired_idempotency_keys(session)
+                await session.commit()
+            if purged:
+                print(f"🧹 Purged {purged} expired idempotency keys")
+        except Exception as e:
+            print(f"❌ Idempotency cleanup failed: {e}")
+        await asyncio.sleep(settings.IDEMPOTENCY_CLEANUP_INTERVAL_MINUTES * 60)
+
+
 # ============================================================
 # EMAIL SERVICE (Resend)
 # ============================================================
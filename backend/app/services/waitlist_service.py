@@ -0,0 +1,366 @@
+import asyncio
+import secrets
+import uuid
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, event, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import async_session
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.service import Service
+from app.models.workspace import Workspace
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.models.automation_log import AutomationLog, AutomationStatus
+from app.services.services import (
+    create_contact, create_booking, get_service, get_available_slots, lock_service_day,
+    invalidate_availability, record_cancellation, send_email, SlotUnavailableError,
+)
+from app.utils.availability import to_minutes
+from app.utils.batching import BatchWriter
+from app.utils.helpers import calculate_end_time
+
+
+# ============================================================
+# JOINING
+# ============================================================
+
+async def join_waitlist(db: AsyncSession, workspace_id: uuid.UUID, data: dict) -> WaitlistEntry:
+    if data["date_to"] < data["date_from"]:
+        raise ValueError("date_to must not be before date_from")
+    earliest = time.fromisoformat(data["earliest_time"]) if data.get("earliest_time") else None
+    latest = time.fromisoformat(data["latest_time"]) if data.get("latest_time") else None
+    if earliest and latest and latest <= earliest:
+        raise ValueError("latest_time must be after earliest_time")
+
+    contact = await create_contact(
+        db, workspace_id,
+        name=data["customer_name"],
+        email=data.get("customer_email"),
+        phone=data.get("customer_phone"),
+        source="booking",
+    )
+    entry = WaitlistEntry(
+        workspace_id=workspace_id,
+        service_id=data["service_id"],
+        contact_id=contact.id,
+        date_from=data["date_from"],
+        date_to=data["date_to"],
+        earliest_time=earliest,
+        latest_time=latest,
+        status=WaitlistStatus.WAITING,
+    )
+    db.add(entry)
+    await db.flush()
+    return entry
+
+
+# ============================================================
+# MATCHING (runs after cancellations commit)
+# ============================================================
+
+def _fits_window(entry: WaitlistEntry, start: int, end: int) -> bool:
+    if entry.earliest_time and start < to_minutes(entry.earliest_time):
+        return False
+    if entry.latest_time and end > to_minutes(entry.latest_time):
+        return False
+    return True
+
+
+async def match_waitlist(session: AsyncSession, service_id: uuid.UUID, day: date) -> list[tuple[str, str, str]]:
+    """Offer the free slots of one service-day to waiting entries, oldest first.
+
+    Each offer holds one seat of a slot as a pending booking until it is
+    accepted or expires; a group slot with several open seats is offered to as
+    many entries. Returns the offer emails (to, subject, body) for the caller
+    to send once the holds are committed.
+    """
+    candidates = (await session.execute(
+        select(WaitlistEntry, Contact)
+        .join(Contact, Contact.id == WaitlistEntry.contact_id)
+        .where(
+            and_(
+                WaitlistEntry.service_id == service_id,
+                WaitlistEntry.status == WaitlistStatus.WAITING,
+                WaitlistEntry.date_from <= day,
+                WaitlistEntry.date_to >= day,
+            )
+        )
+        .order_by(WaitlistEntry.created_at)
+        .limit(settings.WAITLIST_MATCH_CANDIDATES)
+        .with_for_update(of=WaitlistEntry, skip_locked=True)
+    )).all()
+    if not candidates:
+        return []
+
+    service = await get_service(session, service_id)
+    if not service or not service.is_active:
+        return []
+
+    # Same lock as the booking path, so an offer cannot take a slot a customer
+    # is booking right now
+    await lock_service_day(session, service_id, day)
+    slots = [
+        (to_minutes(time.fromisoformat(s["start_time"])), to_minutes(time.fromisoformat(s["end_time"])))
+        for s in await get_available_slots(session, service_id, day, cached=False)
+    ]
+    if not slots:
+        return []
+
+    # Open seats per slot: capacity minus the bookings already in it
+    taken = await session.execute(
+        select(Booking.start_time, Booking.end_time, func.count())
+        .where(
+            and_(
+                Booking.service_id == service_id,
+                Booking.booking_date == day,
+                Booking.status.in_(["confirmed", "pending"]),
+            )
+        )
+        .group_by(Booking.start_time, Booking.end_time)
+    )
+    counts = {(to_minutes(start), to_minutes(end)): count for start, end, count in taken.all()}
+    seats = {slot: (service.capacity or 1) - counts.get(slot, 0) for slot in slots}
+    seats = {slot: n for slot, n in seats.items() if n > 0}
+
+    now = datetime.utcnow()
+    expires = now + timedelta(minutes=settings.WAITLIST_HOLD_MINUTES)
+    offers = []
+    for entry, contact in candidates:
+        if not contact.email:
+            continue  # offers are claimed through the emailed link
+        slot = next((s for s in seats if _fits_window(entry, *s)), None)
+        if slot is None:
+            continue
+        seats[slot] -= 1
+        if not seats[slot]:
+            del seats[slot]
+
+        start = time(slot[0] // 60, slot[0] % 60)
+        booking = Booking(
+            id=uuid.uuid4(),
+            workspace_id=entry.workspace_id,
+            service_id=service_id,
+            contact_id=contact.id,
+            booking_date=day,
+            start_time=start,
+            end_time=calculate_end_time(start, service.duration_minutes),
+            status=BookingStatus.PENDING,
+            customer_name=contact.name,
+            customer_email=contact.email,
+            customer_phone=contact.phone,
+            notes="Held for waitlist",
+        )
+        entry.status = WaitlistStatus.OFFERED
+        entry.booking_id = booking.id
+        entry.offer_token = secrets.token_urlsafe(32)
+        entry.offer_expires_at = expires
+        entry.updated_at = now
+        session.add(booking)
+        offers.append((entry, contact, booking))
+        if not seats:
+            break
+
+    if offers:
+        # The logs reference the holds without a relationship, so the holds
+        # must be written first
+        await session.flush()
+        session.add_all([
+            AutomationLog(
+                workspace_id=entry.workspace_id,
+                event_type="waitlist_offer",
+                action_taken="hold_slot",
+                status=AutomationStatus.SUCCESS,
+                details={"entry_id": str(entry.id), "booking_id": str(booking.id)},
+                related_contact_id=contact.id,
+                related_booking_id=booking.id,
+            )
+            for entry, contact, booking in offers
+        ])
+        await session.flush()
+        invalidate_availability(session, service_id, day)
+    return [
+        (
+            contact.email,
+            f"A spot opened up - {service.name}",
+            f"""
+            <h2>Good news, {contact.name}!</h2>
+            <p>A {service.name} slot opened on {day} at {booking.start_time.strftime('%H:%M')}.</p>
+            <p>We are holding it for you for {settings.WAITLIST_HOLD_MINUTES} minutes.</p>
+            <p><a href="{settings.FRONTEND_URL}/waitlist/{entry.offer_token}">Claim this slot</a></p>
+            """,
+        )
+        for entry, contact, booking in offers
+    ]
+
+
+class WaitlistMatcher(BatchWriter):
+    """Runs match_waitlist for freed service-days off the request path.
+
+    Repeated cancellations for the same service-day coalesce into one match.
+    """
+
+    async def _write(self, batch: list[tuple[uuid.UUID, date]]) -> None:
+        for service_id, day in batch:
+            try:
+                async with async_session() as session:
+                    emails = await match_waitlist(session, service_id, day)
+                    await session.commit()
+                for to, subject, body in emails:
+                    await send_email(to, subject, body)
+            except Exception as e:
+                print(f"❌ Waitlist matching failed for {service_id} on {day}: {e}")
+
+
+waitlist_matcher = WaitlistMatcher(
+    max_batch=settings.WAITLIST_MATCH_BATCH_SIZE,
+    flush_interval=settings.WAITLIST_MATCH_INTERVAL_MS / 1000,
+)
+
+
+_enqueue_tasks: set[asyncio.Task] = set()  # referenced until done so they are not collected
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_waitlist_matches(session: Session) -> None:
+    for service_id, day in session.info.pop("cancelled_slots", ()):
+        task = asyncio.create_task(waitlist_matcher.add((service_id, day), (service_id, day)))
+        _enqueue_tasks.add(task)
+        task.add_done_callback(_enqueue_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_waitlist_matches(session: Session) -> None:
+    session.info.pop("cancelled_slots", None)
+
+
+# ============================================================
+# OFFERS
+# ============================================================
+
+async def get_offer(db: AsyncSession, token: str) -> Optional[WaitlistEntry]:
+    result = await db.execute(
+        select(WaitlistEntry).where(
+            and_(WaitlistEntry.offer_token == token, WaitlistEntry.status == WaitlistStatus.OFFERED)
+        ).with_for_update()
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_offer_details(db: AsyncSession, token: str) -> Optional[dict]:
+    """What an open offer holds, for the claim page; no locks taken"""
+    result = await db.execute(
+        select(WaitlistEntry, Booking, Service, Workspace)
+        .join(Booking, Booking.id == WaitlistEntry.booking_id)
+        .join(Service, Service.id == Booking.service_id)
+        .join(Workspace, Workspace.id == WaitlistEntry.workspace_id)
+        .where(
+            and_(
+                WaitlistEntry.offer_token == token,
+                WaitlistEntry.status == WaitlistStatus.OFFERED,
+                WaitlistEntry.offer_expires_at >= datetime.utcnow(),
+            )
+        )
+    )
+    row = result.first()
+    if not row:
+        return None
+    entry, booking, service, workspace = row
+    return {
+        "business_name": workspace.name,
+        "service_name": service.name,
+        "booking_date": booking.booking_date,
+        "start_time": booking.start_time.isoformat(),
+        "end_time": booking.end_time.isoformat(),
+        "expires_at": entry.offer_expires_at,
+    }
+
+
+async def _release_hold(db: AsyncSession, entry: WaitlistEntry, status: WaitlistStatus) -> None:
+    booking = await db.get(Booking, entry.booking_id) if entry.booking_id else None
+    if booking and booking.status == BookingStatus.PENDING:
+        booking.status = BookingStatus.CANCELLED
+        booking.updated_at = datetime.utcnow()
+        invalidate_availability(db, booking.service_id, booking.booking_date)
+        # Next in line gets the slot
+        record_cancellation(db, booking.service_id, booking.booking_date)
+    entry.status = status
+    entry.offer_token = None
+    entry.updated_at = datetime.utcnow()
+
+
+async def accept_offer(db: AsyncSession, token: str) -> Booking:
+    """Confirm the held booking through create_booking, so it gets the same
+    slot re-check, form submissions and inventory deduction as any booking."""
+    entry = await get_offer(db, token)
+    if not entry:
+        raise ValueError("Offer not found or no longer available")
+    if entry.offer_expires_at and entry.offer_expires_at < datetime.utcnow():
+        await _release_hold(db, entry, WaitlistStatus.EXPIRED)
+        await db.flush()
+        raise ValueError("This offer has expired")
+
+    hold = await db.get(Booking, entry.booking_id) if entry.booking_id else None
+    service = await get_service(db, hold.service_id) if hold else None
+    contact = await db.get(Contact, entry.contact_id)
+    if not hold or not service or not contact:
+        raise ValueError("Offer not found or no longer available")
+
+    try:
+        booking = await create_booking(
+            db, entry.workspace_id, service, contact,
+            {"booking_date": hold.booking_date, "start_time": hold.start_time.isoformat()},
+            hold=hold,
+        )
+    except SlotUnavailableError:
+        # The expiry loop releases whatever is left of the hold
+        raise ValueError("This offer is no longer available")
+    entry.status = WaitlistStatus.BOOKED
+    entry.offer_token = None
+    entry.updated_at = datetime.utcnow()
+    await db.flush()
+    return booking
+
+
+async def decline_offer(db: AsyncSession, token: str) -> bool:
+    entry = await get_offer(db, token)
+    if not entry:
+        return False
+    await _release_hold(db, entry, WaitlistStatus.CANCELLED)
+    await db.flush()
+    return True
+
+
+async def expire_offers(db: AsyncSession) -> int:
+    result = await db.execute(
+        select(WaitlistEntry)
+        .where(
+            and_(
+                WaitlistEntry.status == WaitlistStatus.OFFERED,
+                WaitlistEntry.offer_expires_at < datetime.utcnow(),
+            )
+        )
+        .with_for_update(skip_locked=True)
+    )
+    entries = result.scalars().all()
+    for entry in entries:
+        await _release_hold(db, entry, WaitlistStatus.EXPIRED)
+    await db.flush()
+    return len(entries)
+
+
+async def run_waitlist_expiry() -> None:
+    """Background loop: release holds nobody claimed and pass the slot on"""
+    while True:
+        try:
+            async with async_session() as session:
+                expired = await expire_offers(session)
+                await session.commit()
+            if expired:
+                print(f"⏳ Released {expired} expired waitlist hold(s)")
+        except Exception as e:
+            print(f"❌ Waitlist expiry failed: {e}")
+        await asyncio.sleep(settings.WAITLIST_EXPIRY_INTERVAL_SECONDS)
@@ -0,0 +1,195 @@
+"""
+Slot engine: all arithmetic is done in integer minutes since midnight.
+
+Windows and booked intervals are half-open [start, end). Candidate slots sit on
+a grid of (duration + buffer) minutes anchored at each window's start, the same
+grid the booking page has always shown.
+"""
+from bisect import bisect_right
+from datetime import date, time
+from typing import Iterable, NamedTuple, Optional
+
+Interval = tuple[int, int]
+
+
+def to_minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def minutes_to_iso(m: int) -> str:
+    """Same format as time.isoformat() for whole minutes, e.g. '09:30:00'"""
+    return f"{m // 60:02d}:{m % 60:02d}:00"
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort and union overlapping or touching intervals"""
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(s, e) for s, e in merged]
+
+
+def free_slots(
+    windows: Iterable[Interval],
+    booked: Iterable[Interval],
+    duration: int,
+    buffer: int = 0,
+    not_before: Optional[int] = None,
+) -> list[Interval]:
+    """Open slots of `duration` minutes inside `windows` that keep `buffer`
+    minutes clear of every booked interval.
+
+    `not_before` drops slots starting at or before that minute (used for today).
+    Runs one sweep per window over the merged, sorted booked intervals and jumps
+    straight past each blocking interval instead of testing every grid point.
+    """
+    if duration <= 0:
+        return []
+
+    step = duration + buffer
+    blocked = merge_intervals((s - buffer, e + buffer) for s, e in booked)
+    blocked_ends = [e for _, e in blocked]
+
+    slots: set[int] = set()
+    for w_start, w_end in windows:
+        start = w_start
+        if not_before is not None and start <= not_before:
+            start = w_start + ((not_before - w_start) // step + 1) * step
+
+        j = bisect_right(blocked_ends, start)
+        while start + duration <= w_end:
+            end = start + duration
+            while j < len(blocked) and blocked[j][1] <= start:
+                j += 1
+            if j < len(blocked) and blocked[j][0] < end:
+                # Next grid point that starts at or after the blocking interval ends
+                start = w_start + -(-(blocked[j][1] - w_start) // step) * step
+                continue
+            slots.add(start)
+            start += step
+
+    return [(s, s + duration) for s in sorted(slots)]
+
+
+def free_intervals(windows: Iterable[Interval], booked: Iterable[Interval], buffer: int = 0) -> list[Interval]:
+    """Merged windows minus every booked interval widened by `buffer`"""
+    blocked = merge_intervals((s - buffer, e + buffer) for s, e in booked)
+    free = []
+    j = 0
+    for w_start, w_end in merge_intervals(windows):
+        start = w_start
+        while j < len(blocked) and blocked[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(blocked) and blocked[k][0] < w_end:
+            if blocked[k][0] > start:
+                free.append((start, blocked[k][0]))
+            start = max(start, blocked[k][1])
+            k += 1
+        if start < w_end:
+            free.append((start, w_end))
+    return free
+
+
+def intersect_intervals(a: list[Interval], b: list[Interval]) -> list[Interval]:
+    """Intersection of two sorted, disjoint interval lists in one linear sweep"""
+    out = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            out.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def bundle_starts(free: list[list[Interval]], durations: list[int]) -> list[Interval]:
+    """Start minutes from which services run back to back, each inside its own free intervals.
+
+    Service k starts at offset_k = sum(durations[:k]) after the bundle start, so
+    a free interval [a, b) of service k admits bundle starts [a - offset_k,
+    b - duration_k - offset_k]. The answer is the intersection of those ranges,
+    returned half-open.
+    """
+    feasible: Optional[list[Interval]] = None
+    offset = 0
+    for intervals, duration in zip(free, durations):
+        starts = [(a - offset, b - duration - offset + 1) for a, b in intervals if b - a >= duration]
+        feasible = starts if feasible is None else intersect_intervals(feasible, starts)
+        if not feasible:
+            return []
+        offset += duration
+    return feasible or []
+
+
+def format_slots(slots: Iterable[Interval]) -> list[dict]:
+    return [
+        {"start_time": minutes_to_iso(s), "end_time": minutes_to_iso(e)}
+        for s, e in slots
+    ]
+
+
+class OverrideRule(NamedTuple):
+    start_date: date
+    end_date: date  # inclusive
+    kind: str  # "closed", "custom_hours" or "extra_window"
+    window: Optional[Interval] = None
+
+
+class OverrideIndex:
+    """Date-specific rules compiled into sorted, non-overlapping date segments.
+
+    Each segment carries its resolved effect: replacement windows (None keeps
+    the weekly template, [] closes the day) plus extra windows. Looking up a
+    date is a single bisect.
+    """
+
+    def __init__(self, rules: Iterable[OverrideRule] = ()):
+        rules = [r for r in rules if r.end_date >= r.start_date]
+        bounds = sorted({r.start_date.toordinal() for r in rules} | {r.end_date.toordinal() + 1 for r in rules})
+
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._effects: list[tuple[Optional[list[Interval]], list[Interval]]] = []
+        for seg_start, seg_end in zip(bounds, bounds[1:]):
+            covering = [
+                r for r in rules
+                if r.start_date.toordinal() <= seg_start and r.end_date.toordinal() + 1 >= seg_end
+            ]
+            if not covering:
+                continue
+            replace, extra = None, []
+            if any(r.kind == "closed" for r in covering):
+                replace = []  # closing wins over every other rule
+            else:
+                custom = [r.window for r in covering if r.kind == "custom_hours" and r.window]
+                if custom:
+                    replace = merge_intervals(custom)
+                extra = [r.window for r in covering if r.kind == "extra_window" and r.window]
+            self._starts.append(seg_start)
+            self._ends.append(seg_end)
+            self._effects.append((replace, extra))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def windows_for(self, day: date, weekly: list[Interval]) -> list[Interval]:
+        """Opening windows for `day` given that weekday's template windows"""
+        if not self._starts:
+            return weekly
+        ordinal = day.toordinal()
+        i = bisect_right(self._starts, ordinal) - 1
+        if i < 0 or ordinal >= self._ends[i]:
+            return weekly
+        replace, extra = self._effects[i]
+        windows = weekly if replace is None else replace
+        return windows + extra if extra else windows
@@ -0,0 +1,67 @@
+"""
+Minute-bitmap availability index.
+
+Each service-day is a 1440-entry boolean row (True = minute is inside an
+availability window and clear of every booking plus its buffer). Rows for many
+days are stacked so the first fitting start can be found for all of them with
+one cumulative-sum run-length test instead of walking slot lists day by day.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.utils.availability import Interval
+
+MINUTES_PER_DAY = 1440
+
+
+def day_bitmap(windows: Iterable[Interval], booked: Iterable[Interval], buffer: int = 0) -> np.ndarray:
+    free = np.zeros(MINUTES_PER_DAY, dtype=bool)
+    for start, end in windows:
+        free[max(start, 0):min(end, MINUTES_PER_DAY)] = True
+    for start, end in booked:
+        free[max(start - buffer, 0):min(end + buffer, MINUTES_PER_DAY)] = False
+    return free
+
+
+def start_grid(windows: Iterable[Interval], duration: int, buffer: int = 0, not_before: Optional[int] = None) -> np.ndarray:
+    """Minutes where the booking page offers a slot: every (duration + buffer)
+    from each window start, while the slot still ends inside that window."""
+    grid = np.zeros(MINUTES_PER_DAY, dtype=bool)
+    step = duration + buffer
+    for start, end in windows:
+        grid[np.arange(start, end - duration + 1, step)] = True
+    if not_before is not None:
+        grid[:not_before + 1] = False
+    return grid
+
+
+def fits(free: np.ndarray, grid: np.ndarray, duration: int) -> np.ndarray:
+    """Boolean (rows, 1441 - duration) matrix: grid minute i starts `duration` free minutes.
+
+    free and grid are (rows, 1440) boolean matrices.
+    """
+    rows = free.shape[0]
+    # run[:, i] = number of free minutes in [i, i + duration)
+    cumulative = np.zeros((rows, MINUTES_PER_DAY + 1), dtype=np.int32)
+    np.cumsum(free, axis=1, dtype=np.int32, out=cumulative[:, 1:])
+    run = cumulative[:, duration:] - cumulative[:, :-duration]
+    return (run == duration) & grid[:, :run.shape[1]]
+
+
+def first_fit(free: np.ndarray, grid: np.ndarray, duration: int) -> np.ndarray:
+    """First grid minute per row that starts `duration` free minutes, or -1"""
+    rows = free.shape[0]
+    if rows == 0 or duration <= 0 or duration > MINUTES_PER_DAY:
+        return np.full(rows, -1, dtype=np.int64)
+
+    found = fits(free, grid, duration)
+    return np.where(found.any(axis=1), found.argmax(axis=1), -1)
+
+
+def all_fits(free: np.ndarray, grid: np.ndarray, duration: int) -> list[Interval]:
+    """Every open slot of one day row, as (start, end) minutes"""
+    if duration <= 0 or duration > MINUTES_PER_DAY:
+        return []
+    starts = np.flatnonzero(fits(free[np.newaxis], grid[np.newaxis], duration)[0])
+    return [(int(s), int(s) + duration) for s in starts]
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Hashable, Optional
+
+
+class BatchWriter:
+    """Buffer rows in memory and hand them to _write() in batches.
+
+    A batch is written when max_batch rows are pending, or flush_interval
+    seconds after the first row of the batch arrived, whichever is first.
+    Rows are keyed so repeated updates to the same key coalesce into one.
+
+    A failed write is retried `retries` times with doubling delays; after that
+    the rows go back into the buffer for the next flush, so rows a caller has
+    already acknowledged are not dropped on a transient database error. A row
+    re-queued max_requeues times is dropped so one bad row cannot wedge the
+    buffer forever.
+    """
+
+    def __init__(self, max_batch: int = 200, flush_interval: float = 0.25, retries: int = 3, retry_delay: float = 0.2,
+                 max_requeues: int = 20):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_requeues = max_requeues
+        self._pending: dict[Hashable, Any] = {}
+        self._requeues: dict[Hashable, int] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    def _merge(self, old: Any, new: Any) -> Any:
+        """Combine two rows for the same key. Later rows win by default."""
+        return new
+
+    async def _write(self, batch: list) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: Hashable, row: Any) -> None:
+        batch = None
+        async with self._lock:
+            if key in self._pending:
+                self._pending[key] = self._merge(self._pending[key], row)
+            else:
+                self._pending[key] = row
+
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+
+        # Writing outside the lock lets new rows queue up during the write;
+        # the caller awaiting it gives natural backpressure under bursts.
+        if batch:
+            await self._safe_write(batch)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch = self._take()
+        if batch:
+            await self._safe_write(batch)
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        if self._pending:
+            # Nothing left to retry on; make the loss impossible to miss
+            print(f"❌ {type(self).__name__} shut down with {len(self._pending)} unwritten rows")
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _take(self) -> list[tuple[Hashable, Any]]:
+        batch = list(self._pending.items())
+        self._pending = {}
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        return batch
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def _safe_write(self, batch: list[tuple[Hashable, Any]]) -> None:
+        rows = [row for _, row in batch]
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                await self._write(rows)
+                for key, _ in batch:
+                    self._requeues.pop(key, None)
+                return
+            except Exception as e:
+                print(f"❌ {type(self).__name__} failed to write {len(rows)} rows (attempt {attempt + 1}): {e}")
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+        await self._requeue(batch)
+
+    async def _requeue(self, batch: list[tuple[Hashable, Any]]) -> None:
+        dropped = 0
+        async with self._lock:
+            for key, row in batch:
+                count = self._requeues.get(key, 0) + 1
+                if count > self.max_requeues:
+                    self._requeues.pop(key, None)
+                    dropped += 1
+                    continue
+                self._requeues[key] = count
+                # Rows that arrived for the same key meanwhile are newer
+                self._pending[key] = self._merge(row, self._pending[key]) if key in self._pending else row
+            if self._pending and self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+        if dropped:
+            print(f"❌ {type(self).__name__} dropped {dropped} rows after {self.max_requeues} failed flushes")
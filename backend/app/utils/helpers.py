@@ -1,3 +1,4 @@
+import base64
 import re
 import uuid
 from datetime import datetime, date, time, timedelta
@@ -21,6 +22,35 @@ def generate_token() -> str:
     return str(uuid.uuid4())
 
 
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Canonical form used for contact lookups (matches the lower(email) index)"""
+    if not email:
+        return None
+    return email.strip().lower()
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Strip formatting from a phone number (matches the normalized phone index)"""
+    if not phone:
+        return None
+    return re.sub(r'[^0-9+]', '', phone) or None
+
+
+def encode_cursor(*parts) -> str:
+    """Opaque pagination cursor from the sort key of the last row"""
+    raw = "|".join(p.isoformat() if hasattr(p, "isoformat") else str(p) for p in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
 def combine_date_time(d: date, t: time) -> datetime:
     """Combine date and time into datetime"""
     return datetime.combine(d, t)
@@ -33,29 +63,6 @@ def calculate_end_time(start: time, duration_minutes: int) -> time:
     return end_dt.time()
 
 
-def time_slots(
-    start: time,
-    end: time,
-    duration_minutes: int,
-    buffer_minutes: int = 0
-) -> list[dict]:
-    """Generate available time slots between start and end"""
-    slots = []
-    current = datetime.combine(date.today(), start)
-    end_dt = datetime.combine(date.today(), end)
-    slot_duration = timedelta(minutes=duration_minutes + buffer_minutes)
-
-    while current + timedelta(minutes=duration_minutes) <= end_dt:
-        slot_end = current + timedelta(minutes=duration_minutes)
-        slots.append({
-            "start_time": current.time().isoformat(),
-            "end_time": slot_end.time().isoformat(),
-        })
-        current += slot_duration
-
-    return slots
-
-
 def format_datetime(dt: Optional[datetime]) -> Optional[str]:
     """Format datetime to ISO string"""
     if dt is None:
@@ -0,0 +1,88 @@
+"""
+Minimal iCalendar (RFC 5545) writer for booking feeds.
+
+Only what a read-only feed needs: escaped text values, 75-octet line folding
+and floating or TZID-qualified local date-times.
+"""
+from datetime import date, datetime, time
+from typing import Optional
+
+CRLF = "\r\n"
+
+
+def escape_text(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Fold a content line at 75 octets, never splitting a UTF-8 character"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + CRLF
+
+    parts = []
+    current = ""
+    size = 0
+    limit = 75
+    for ch in line:
+        width = len(ch.encode())
+        if size + width > limit:
+            parts.append(current)
+            current, size, limit = "", 0, 74  # continuation lines start with a space
+        current += ch
+        size += width
+    parts.append(current)
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def format_local(d: date, t: time) -> str:
+    return datetime.combine(d, t).strftime("%Y%m%dT%H%M%S")
+
+
+def format_utc(dt: datetime) -> str:
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str, timezone: Optional[str] = None) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//CareOps//Bookings//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    if timezone:
+        lines.append(f"X-WR-TIMEZONE:{timezone}")
+    return "".join(fold(line) for line in lines)
+
+
+def calendar_footer() -> str:
+    return "END:VCALENDAR" + CRLF
+
+
+def event(uid: str, day: date, start: time, end: time, summary: str, stamp: datetime,
+          timezone: Optional[str] = None, description: Optional[str] = None, cancelled: bool = False) -> str:
+    tzid = f";TZID={timezone}" if timezone else ""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_utc(stamp)}",
+        f"LAST-MODIFIED:{format_utc(stamp)}",
+        f"DTSTART{tzid}:{format_local(day, start)}",
+        f"DTEND{tzid}:{format_local(day, end)}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"STATUS:{'CANCELLED' if cancelled else 'CONFIRMED'}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
@@ -0,0 +1,163 @@
+"""
+Memory-mapped availability snapshots shared by all workers on a host.
+
+Per service there are four files in the snapshot directory:
+
+    {service_id}.ctl   16 bytes: data_version (u64), generation (u64)
+    {service_id}.snap  header + two packed 1440-bit planes per day
+    {service_id}.lock  serializes updates to the control file
+    {service_id}.build held by the single process rebuilding the snapshot
+
+data_version is bumped after every commit that changes the service's
+availability. A snapshot records the data_version it was built from and is
+only served while the two match. generation is bumped each time a new
+snapshot file is published, telling readers to re-map it.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import uuid
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from app.utils.availability import Interval
+from app.utils.availability_index import MINUTES_PER_DAY, all_fits
+
+MAGIC = b"CAREAV01"
+HEADER = struct.Struct("<8sQQqIHH")  # magic, generation, data_version, first day ordinal, days, duration, buffer
+HEADER_SIZE = 64
+CONTROL = struct.Struct("<QQ")  # data_version, generation
+PLANE_BYTES = MINUTES_PER_DAY // 8
+DAY_BYTES = 2 * PLANE_BYTES  # free minutes, slot start grid
+
+
+class Snapshot:
+    def __init__(self, buf: mmap.mmap):
+        self.buf = buf
+        magic, self.generation, self.data_version, first, self.days, self.duration, self.buffer = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not an availability snapshot")
+        self.first_day = date.fromordinal(first)
+
+    def planes(self, day: date) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        offset = (day - self.first_day).days
+        if offset < 0 or offset >= self.days:
+            return None
+        start = HEADER_SIZE + offset * DAY_BYTES
+        raw = np.frombuffer(self.buf, dtype=np.uint8, count=DAY_BYTES, offset=start)
+        free = np.unpackbits(raw[:PLANE_BYTES]).astype(bool)
+        grid = np.unpackbits(raw[PLANE_BYTES:]).astype(bool)
+        return free, grid
+
+
+class SnapshotStore:
+    """Reads and publishes snapshots under one directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._controls: dict[uuid.UUID, mmap.mmap] = {}
+        self._snapshots: dict[uuid.UUID, Snapshot] = {}
+
+    def _path(self, service_id: uuid.UUID, ext: str) -> str:
+        return os.path.join(self.directory, f"{service_id}.{ext}")
+
+    def _control(self, service_id: uuid.UUID) -> mmap.mmap:
+        ctl = self._controls.get(service_id)
+        if ctl is None:
+            os.makedirs(self.directory, exist_ok=True)
+            fd = os.open(self._path(service_id, "ctl"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < CONTROL.size:
+                    os.ftruncate(fd, CONTROL.size)
+                ctl = mmap.mmap(fd, CONTROL.size)
+            finally:
+                os.close(fd)
+            self._controls[service_id] = ctl
+        return ctl
+
+    def _bump(self, service_id: uuid.UUID, index: int) -> int:
+        ctl = self._control(service_id)
+        with open(self._path(service_id, "lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            values = list(CONTROL.unpack_from(ctl))
+            values[index] += 1
+            CONTROL.pack_into(ctl, 0, *values)
+            return values[index]
+
+    def data_version(self, service_id: uuid.UUID) -> int:
+        return CONTROL.unpack_from(self._control(service_id))[0]
+
+    def mark_changed(self, service_id: uuid.UUID) -> None:
+        self._bump(service_id, 0)
+
+    def get(self, service_id: uuid.UUID) -> Optional[Snapshot]:
+        """Current snapshot if it matches the latest data_version, else None"""
+        data_version, generation = CONTROL.unpack_from(self._control(service_id))
+        snap = self._snapshots.get(service_id)
+        if snap is None or snap.generation != generation:
+            snap = self._map(service_id)
+            if snap is None:
+                return None
+        if snap.data_version != data_version:
+            return None
+        return snap
+
+    def needs_rebuild(self, service_id: uuid.UUID) -> bool:
+        """True when there is no current snapshot or it no longer starts today"""
+        snap = self.get(service_id)
+        return snap is None or snap.first_day < date.today()
+
+    def _map(self, service_id: uuid.UUID) -> Optional[Snapshot]:
+        try:
+            with open(self._path(service_id, "snap"), "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        # The previous mapping is released once nothing references it
+        snap = Snapshot(buf)
+        self._snapshots[service_id] = snap
+        return snap
+
+    def slots(self, service_id: uuid.UUID, day: date, not_before: Optional[int] = None) -> Optional[list[Interval]]:
+        snap = self.get(service_id)
+        if snap is None:
+            return None
+        planes = snap.planes(day)
+        if planes is None:
+            return None
+        free, grid = planes
+        if not_before is not None:
+            grid[:not_before + 1] = False
+        return all_fits(free, grid, snap.duration)
+
+    def try_lock_rebuild(self, service_id: uuid.UUID):
+        """Open file handle holding the rebuild lock, or None if another process is rebuilding"""
+        os.makedirs(self.directory, exist_ok=True)
+        handle = open(self._path(service_id, "build"), "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return None
+        return handle
+
+    def publish(self, service_id: uuid.UUID, data_version: int, first_day: date, duration: int, buffer: int,
+                free_rows: np.ndarray, grid_rows: np.ndarray) -> None:
+        """Write a new snapshot next to the old one and atomically swap it in"""
+        days = free_rows.shape[0]
+        _, generation = CONTROL.unpack_from(self._control(service_id))
+        header = bytearray(HEADER_SIZE)
+        HEADER.pack_into(header, 0, MAGIC, generation + 1, data_version, first_day.toordinal(), days, duration, buffer)
+        body = np.concatenate(
+            [np.packbits(free_rows, axis=1), np.packbits(grid_rows, axis=1)], axis=1
+        ).tobytes()
+
+        tmp = self._path(service_id, f"snap.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(body)
+        os.replace(tmp, self._path(service_id, "snap"))
+        self._bump(service_id, 1)
@@ -0,0 +1,50 @@
+"""
+Dense-calendar microbenchmark: the interval sweep against the per-slot loop
+it replaced.
+
+Run from backend/: python -m tests.bench_availability
+"""
+import random
+import timeit
+from datetime import time
+
+from app.utils.availability import free_slots
+from tests.reference import old_available_slots
+
+SCENARIOS = [
+    # (label, windows, duration, buffer, bookings)
+    ("9-17, 30 min, 10 bookings", [(540, 1020)], 30, 0, 10),
+    ("9-17, 15 min, 40 bookings", [(540, 1020)], 15, 0, 40),
+    ("0-24, 5 min, 200 bookings", [(0, 1439)], 5, 0, 200),
+    ("split day, 10 min + 5 buffer, 120 bookings", [(420, 720), (780, 1200)], 10, 5, 120),
+]
+
+
+def _as_time(m: int) -> time:
+    return time(m // 60, m % 60)
+
+
+def _dense_bookings(rng: random.Random, windows, duration: int, count: int) -> list[tuple[int, int]]:
+    booked = []
+    for _ in range(count):
+        w_start, w_end = rng.choice(windows)
+        start = rng.randrange(w_start, max(w_start + 1, w_end - duration))
+        booked.append((start, start + duration))
+    return booked
+
+
+def main(number: int = 200) -> None:
+    rng = random.Random(0)
+    print(f"{'scenario':<45} {'old loop':>12} {'sweep':>12} {'speedup':>8}")
+    for label, windows, duration, buffer, count in SCENARIOS:
+        booked = _dense_bookings(rng, windows, duration, count)
+        old_windows = [(_as_time(s), _as_time(e)) for s, e in windows]
+        old_booked = [(_as_time(s), _as_time(min(e, 1439))) for s, e in booked]
+
+        old = timeit.timeit(lambda: old_available_slots(old_windows, old_booked, duration, buffer), number=number)
+        new = timeit.timeit(lambda: free_slots(windows, booked, duration, buffer), number=number)
+        print(f"{label:<45} {old / number * 1e6:>10.1f}us {new / number * 1e6:>10.1f}us {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
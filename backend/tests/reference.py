@@ -0,0 +1,118 @@
+"""
+Brute-force reference implementations of the slot engine, for the property
+tests and the benchmark. Slow on purpose: every minute or grid point is
+checked directly.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from app.utils.availability import Interval
+
+MINUTES_PER_DAY = 1440
+
+
+def old_time_slots(start: time, end: time, duration_minutes: int, buffer_minutes: int = 0) -> list[dict]:
+    """helpers.time_slots as it was before the interval sweep"""
+    slots = []
+    current = datetime.combine(date.today(), start)
+    end_dt = datetime.combine(date.today(), end)
+    slot_duration = timedelta(minutes=duration_minutes + buffer_minutes)
+
+    while current + timedelta(minutes=duration_minutes) <= end_dt:
+        slot_end = current + timedelta(minutes=duration_minutes)
+        slots.append({
+            "start_time": current.time().isoformat(),
+            "end_time": slot_end.time().isoformat(),
+        })
+        current += slot_duration
+
+    return slots
+
+
+def old_available_slots(windows: list[tuple[time, time]], booked: list[tuple[time, time]], duration: int,
+                        buffer: int = 0, now: Optional[time] = None) -> list[dict]:
+    """The per-slot loop get_available_slots ran before the interval sweep"""
+    all_slots = []
+    for w_start, w_end in windows:
+        for slot in old_time_slots(w_start, w_end, duration, buffer):
+            slot_start = time.fromisoformat(slot["start_time"])
+            slot_end = time.fromisoformat(slot["end_time"])
+            if any(slot_start < b_end and slot_end > b_start for b_start, b_end in booked):
+                continue
+            if now is not None and slot_start <= now:
+                continue
+            all_slots.append(slot)
+    return all_slots
+
+
+def scan_free_slots(windows: list[Interval], booked: list[Interval], duration: int, buffer: int = 0,
+                    not_before: Optional[int] = None) -> list[Interval]:
+    """Every grid point of every window, tested against every widened booking"""
+    if duration <= 0:
+        return []
+    starts = set()
+    for w_start, w_end in windows:
+        start = w_start
+        while start + duration <= w_end:
+            clash = any(start < e + buffer and start + duration > s - buffer for s, e in booked)
+            if not clash and (not_before is None or start > not_before):
+                starts.add(start)
+            start += duration + buffer
+    return [(s, s + duration) for s in sorted(starts)]
+
+
+def minute_mask(windows: list[Interval], booked: list[Interval], buffer: int = 0) -> list[bool]:
+    free = [False] * MINUTES_PER_DAY
+    for start, end in windows:
+        for m in range(max(start, 0), min(end, MINUTES_PER_DAY)):
+            free[m] = True
+    for start, end in booked:
+        for m in range(max(start - buffer, 0), min(end + buffer, MINUTES_PER_DAY)):
+            free[m] = False
+    return free
+
+
+def mask_runs(free: list[bool]) -> list[Interval]:
+    runs = []
+    start = None
+    for m, is_free in enumerate(free + [False]):
+        if is_free and start is None:
+            start = m
+        elif not is_free and start is not None:
+            runs.append((start, m))
+            start = None
+    return runs
+
+
+def scan_bundle_starts(masks: list[list[bool]], durations: list[int]) -> list[int]:
+    """Minutes from which every service runs back to back on free minutes"""
+    total = sum(durations)
+    starts = []
+    for start in range(MINUTES_PER_DAY - total + 1):
+        offset = start
+        ok = True
+        for free, duration in zip(masks, durations):
+            if not all(free[offset:offset + duration]):
+                ok = False
+                break
+            offset += duration
+        if ok:
+            starts.append(start)
+    return starts
+
+
+def random_windows(rng: random.Random, max_windows: int = 3) -> list[Interval]:
+    windows = []
+    for _ in range(rng.randint(1, max_windows)):
+        start = rng.randrange(0, 1380)
+        windows.append((start, min(MINUTES_PER_DAY, start + rng.randint(15, 600))))
+    return windows
+
+
+def random_bookings(rng: random.Random, count: int, max_length: int = 120) -> list[Interval]:
+    booked = []
+    for _ in range(count):
+        start = rng.randrange(0, 1420)
+        booked.append((start, min(MINUTES_PER_DAY, start + rng.randint(5, max_length))))
+    return booked
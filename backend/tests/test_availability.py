@@ -0,0 +1,153 @@
+"""
+Randomized comparisons of the slot engine against brute-force references.
+
+Run from backend/: python -m pytest tests
+"""
+import random
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.utils.availability import (
+    OverrideIndex, OverrideRule, bundle_starts, format_slots, free_intervals, free_slots,
+    intersect_intervals, merge_intervals, minutes_to_iso, to_minutes,
+)
+from tests.reference import (
+    mask_runs, minute_mask, old_available_slots, random_bookings, random_windows,
+    scan_bundle_starts, scan_free_slots,
+)
+
+CASES = 500
+
+
+def _as_time(m: int) -> time:
+    return time(m // 60, m % 60)
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_free_slots_matches_grid_scan(seed):
+    rng = random.Random(seed)
+    windows = random_windows(rng)
+    booked = random_bookings(rng, rng.randint(0, 25))
+    duration = rng.choice([5, 15, 30, 45, 60, 90])
+    buffer = rng.choice([0, 0, 5, 10, 15])
+    not_before = rng.choice([None, rng.randrange(0, 1440)])
+
+    assert free_slots(windows, booked, duration, buffer, not_before) == \
+        scan_free_slots(windows, booked, duration, buffer, not_before)
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_free_slots_matches_old_loop_without_buffer(seed):
+    # Before the sweep, bookings did not block the buffer around them, so the
+    # old loop and the new engine agree exactly when buffer is zero
+    rng = random.Random(seed)
+    windows = [(w_start, min(w_end, 1439)) for w_start, w_end in random_windows(rng, max_windows=1)]
+    booked = [(s, min(e, 1439)) for s, e in random_bookings(rng, rng.randint(0, 15))]
+    duration = rng.choice([15, 30, 60])
+    now = rng.choice([None, rng.randrange(0, 1440)])
+
+    old = old_available_slots(
+        [(_as_time(s), _as_time(e)) for s, e in windows],
+        [(_as_time(s), _as_time(e)) for s, e in booked],
+        duration,
+        now=_as_time(now) if now is not None else None,
+    )
+    assert format_slots(free_slots(windows, booked, duration, 0, now)) == old
+
+
+def test_free_slots_zero_duration():
+    assert free_slots([(540, 1020)], [], 0) == []
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_merge_intervals_matches_minute_mask(seed):
+    rng = random.Random(seed)
+    intervals = random_bookings(rng, rng.randint(0, 20))
+    assert merge_intervals(intervals) == mask_runs(minute_mask(intervals, []))
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_free_intervals_matches_minute_mask(seed):
+    rng = random.Random(seed)
+    windows = random_windows(rng)
+    booked = random_bookings(rng, rng.randint(0, 20))
+    buffer = rng.choice([0, 5, 15])
+
+    assert free_intervals(windows, booked, buffer) == mask_runs(minute_mask(windows, booked, buffer))
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_intersect_intervals_matches_minute_mask(seed):
+    rng = random.Random(seed)
+    a = merge_intervals(random_bookings(rng, rng.randint(0, 10)))
+    b = merge_intervals(random_bookings(rng, rng.randint(0, 10)))
+    expected = mask_runs([x and y for x, y in zip(minute_mask(a, []), minute_mask(b, []))])
+
+    # Touching pieces are not merged by the sweep, so compare the minutes covered
+    assert merge_intervals(intersect_intervals(a, b)) == expected
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_bundle_starts_matches_scan(seed):
+    rng = random.Random(seed)
+    services = rng.randint(1, 3)
+    masks, free, durations = [], [], []
+    for _ in range(services):
+        windows = random_windows(rng)
+        booked = random_bookings(rng, rng.randint(0, 10))
+        masks.append(minute_mask(windows, booked))
+        free.append(free_intervals(windows, booked))
+        durations.append(rng.choice([15, 30, 60]))
+
+    starts = [m for a, b in bundle_starts(free, durations) for m in range(a, b)]
+    assert starts == scan_bundle_starts(masks, durations)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_override_index_matches_naive_rules(seed):
+    rng = random.Random(seed)
+    base = date(2026, 1, 1)
+    rules = []
+    for _ in range(rng.randint(0, 8)):
+        start = base + timedelta(days=rng.randrange(0, 60))
+        end = start + timedelta(days=rng.randrange(0, 10))
+        kind = rng.choice(["closed", "custom_hours", "extra_window"])
+        window = None if kind == "closed" else tuple(sorted(rng.sample(range(0, 1440, 15), 2)))
+        rules.append(OverrideRule(start, end, kind, window))
+    index = OverrideIndex(rules)
+    weekly = [(540, 1020)]
+
+    for offset in range(-5, 80):
+        day = base + timedelta(days=offset)
+        covering = [r for r in rules if r.start_date <= day <= r.end_date]
+        if any(r.kind == "closed" for r in covering):
+            expected = []
+        else:
+            custom = [r.window for r in covering if r.kind == "custom_hours"]
+            expected = merge_intervals(custom) if custom else weekly
+            expected = expected + [r.window for r in covering if r.kind == "extra_window"]
+        assert sorted(index.windows_for(day, weekly)) == sorted(expected)
+
+
+def test_minute_conversions_round_trip():
+    for m in range(0, 1440, 7):
+        assert to_minutes(time.fromisoformat(minutes_to_iso(m))) == m
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_bitmap_index_matches_sweep(seed):
+    np = pytest.importorskip("numpy")
+    from app.utils.availability_index import all_fits, day_bitmap, start_grid
+
+    rng = random.Random(seed)
+    windows = random_windows(rng)
+    booked = random_bookings(rng, rng.randint(0, 20))
+    duration = rng.choice([15, 30, 60])
+    buffer = rng.choice([0, 10])
+
+    # The bitmap tests whole slots on the grid, the sweep does the same on intervals
+    free = day_bitmap(windows, booked, buffer)
+    grid = start_grid(merge_intervals(windows), duration, buffer)
+    assert isinstance(free, np.ndarray)
+    assert all_fits(free, grid, duration) == free_slots(merge_intervals(windows), booked, duration, buffer)
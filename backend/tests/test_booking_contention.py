@@ -0,0 +1,112 @@
+"""
+Concurrent create_booking calls for one slot against a real PostgreSQL.
+
+The service-day advisory lock is what keeps two requests from both seeing a
+slot free, so this needs a database; it is skipped unless TEST_DATABASE_URL
+points at a throwaway database (tables are created in it):
+
+    TEST_DATABASE_URL=postgresql://localhost/careops_test python -m pytest tests
+"""
+import asyncio
+import os
+import uuid
+from datetime import date, time, timedelta
+
+import pytest
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+pytest.importorskip("asyncpg")
+pytest.importorskip("numpy")
+
+os.environ.setdefault("DATABASE_URL", DATABASE_URL)
+os.environ.setdefault("SECRET_KEY", "test")
+
+from sqlalchemy import and_, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import AvailabilitySlot, Booking, Service, User, Workspace  # noqa: E402
+from app.services.services import SlotUnavailableError, create_booking, create_contact, get_service  # noqa: E402
+
+CONCURRENT_REQUESTS = 20
+SLOT = time(10, 0)
+
+
+def _async_url(url: str) -> str:
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+async def _seed(sessions: async_sessionmaker, capacity: int) -> tuple[uuid.UUID, uuid.UUID, date]:
+    day = date.today() + timedelta(days=7)
+    async with sessions() as db:
+        owner = User(id=uuid.uuid4(), email=f"owner-{uuid.uuid4().hex}@example.com", password_hash="x", full_name="Owner")
+        db.add(owner)
+        await db.flush()
+        workspace = Workspace(
+            id=uuid.uuid4(), name="Contention", slug=f"contention-{uuid.uuid4().hex}",
+            contact_email="owner@example.com", owner_id=owner.id,
+        )
+        db.add(workspace)
+        await db.flush()
+        service = Service(id=uuid.uuid4(), workspace_id=workspace.id, name="Session", duration_minutes=60, capacity=capacity)
+        db.add(service)
+        await db.flush()
+        db.add(AvailabilitySlot(service_id=service.id, day_of_week=day.weekday(), start_time=time(9), end_time=time(17)))
+        await db.commit()
+        return workspace.id, service.id, day
+
+
+async def _attempt(sessions: async_sessionmaker, workspace_id: uuid.UUID, service_id: uuid.UUID, day: date, n: int) -> bool:
+    async with sessions() as db:
+        service = await get_service(db, service_id)
+        contact = await create_contact(
+            db, workspace_id, name=f"Customer {n}", email=f"customer-{n}-{uuid.uuid4().hex}@example.com",
+            source="booking", flush=False,
+        )
+        try:
+            await create_booking(db, workspace_id, service, contact, {
+                "booking_date": day,
+                "start_time": SLOT.isoformat(),
+                "customer_name": contact.name,
+                "customer_email": contact.email,
+            })
+            await db.commit()
+            return True
+        except SlotUnavailableError:
+            await db.rollback()
+            return False
+
+
+async def _contend(capacity: int) -> tuple[int, int]:
+    engine = create_async_engine(_async_url(DATABASE_URL), pool_size=CONCURRENT_REQUESTS, max_overflow=0)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        workspace_id, service_id, day = await _seed(sessions, capacity)
+
+        results = await asyncio.gather(*[
+            _attempt(sessions, workspace_id, service_id, day, n) for n in range(CONCURRENT_REQUESTS)
+        ])
+
+        async with sessions() as db:
+            stored = await db.scalar(
+                select(func.count()).select_from(Booking).where(
+                    and_(Booking.service_id == service_id, Booking.booking_date == day, Booking.start_time == SLOT)
+                )
+            )
+        return sum(results), stored
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("capacity", [1, 3])
+def test_concurrent_bookings_fill_slot_exactly(capacity):
+    winners, stored = asyncio.run(_contend(capacity))
+    assert winners == capacity
+    assert stored == capacity
@@ -32,12 +32,10 @@ export default function BookingDetailPage() {
     try {
       const [bookingRes, formsRes] = await Promise.all([
         api.get(`/bookings/${bookingId}`),
-        api.get("/forms/submissions"),
+        api.get(`/forms/submissions?booking_id=${bookingId}`),
       ]);
       setBooking(bookingRes.data);
-      setForms(
-        formsRes.data.submissions.filter((f: FormSubmission) => f.booking_id === bookingId)
-      );
+      setForms(formsRes.data.submissions);
     } catch {
       toast.error("Failed to load booking");
     } finally {
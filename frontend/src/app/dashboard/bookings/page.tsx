@@ -14,16 +14,22 @@ export default function BookingsPage() {
   const [bookings, setBookings] = useState<Booking[]>([]);
   const [loading, setLoading] = useState(true);
   const [statusFilter, setStatusFilter] = useState("all");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchBookings();
   }, [statusFilter]);
 
-  const fetchBookings = async () => {
+  const fetchBookings = async (cursor?: string) => {
     try {
-      const params = statusFilter !== "all" ? `?status=${statusFilter}` : "";
-      const res = await api.get(`/bookings${params}`);
-      setBookings(res.data.bookings);
+      const params = new URLSearchParams();
+      if (statusFilter !== "all") params.set("status", statusFilter);
+      if (cursor) params.set("cursor", cursor);
+      const query = params.toString() ? `?${params.toString()}` : "";
+      const res = await api.get(`/bookings${query}`);
+      setBookings((prev) => (cursor ? [...prev, ...res.data.bookings] : res.data.bookings));
+      setNextCursor(res.data.next_cursor);
     } catch {
       toast.error("Failed to load bookings");
     } finally {
@@ -31,6 +37,13 @@ export default function BookingsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchBookings(nextCursor);
+    setLoadingMore(false);
+  };
+
   const updateStatus = async (id: string, status: string) => {
     try {
       await api.put(`/bookings/${id}/status`, { status });
@@ -126,6 +139,14 @@ export default function BookingsPage() {
               </CardContent>
             </Card>
           ))}
+          {nextCursor && (
+            <div className="flex justify-center pt-2">
+              <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+                Load more
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
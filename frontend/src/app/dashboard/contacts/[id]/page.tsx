@@ -32,15 +32,13 @@ export default function ContactDetailPage() {
     try {
       const [contactRes, bookingsRes, convRes] = await Promise.all([
         api.get(`/contacts/${contactId}`),
-        api.get("/bookings"),
+        api.get(`/bookings?contact_id=${contactId}`),
         api.get("/conversations"),
       ]);
       setContact(contactRes.data);
 
-      // Filter bookings and conversations for this contact
-      setBookings(
-        bookingsRes.data.bookings.filter((b: Booking) => b.contact_id === contactId)
-      );
+      // Bookings are filtered server-side; conversations still client-side
+      setBookings(bookingsRes.data.bookings);
       setConversations(
         convRes.data.conversations.filter((c: Conversation) => c.contact_id === contactId)
       );
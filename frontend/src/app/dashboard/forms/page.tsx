@@ -14,6 +14,8 @@ export default function FormsPage() {
   const [templates, setTemplates] = useState<FormTemplate[]>([]);
   const [submissions, setSubmissions] = useState<FormSubmission[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchData();
@@ -27,6 +29,7 @@ export default function FormsPage() {
       ]);
       setTemplates(tmplRes.data.templates);
       setSubmissions(subRes.data.submissions);
+      setNextCursor(subRes.data.next_cursor);
     } catch {
       toast.error("Failed to load forms data");
     } finally {
@@ -34,6 +37,20 @@ export default function FormsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get(`/forms/submissions?cursor=${encodeURIComponent(nextCursor)}`);
+      setSubmissions((prev) => [...prev, ...res.data.submissions]);
+      setNextCursor(res.data.next_cursor);
+    } catch {
+      toast.error("Failed to load submissions");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const copyFormLink = (token: string) => {
     const url = `${window.location.origin}/p/forms/${token}`;
     navigator.clipboard.writeText(url);
@@ -144,6 +161,14 @@ export default function FormsPage() {
               </Card>
             ))
           )}
+          {nextCursor && (
+            <div className="flex justify-center pt-2">
+              <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+                Load more
+              </Button>
+            </div>
+          )}
         </TabsContent>
 
         <TabsContent value="templates" className="space-y-3 mt-4">
@@ -0,0 +1,175 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { useParams } from "next/navigation";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
+import { toast } from "sonner";
+import axios from "axios";
+import { Loader2, CheckCircle2, Calendar, Clock, XCircle, Zap } from "lucide-react";
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api";
+
+interface WaitlistOffer {
+  business_name: string;
+  service_name: string;
+  booking_date: string;
+  start_time: string;
+  end_time: string;
+  expires_at: string | null;
+}
+
+export default function WaitlistOfferPage() {
+  const params = useParams();
+  const token = params.token as string;
+
+  const [offer, setOffer] = useState<WaitlistOffer | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [submitting, setSubmitting] = useState(false);
+  const [result, setResult] = useState<"booked" | "declined" | null>(null);
+
+  useEffect(() => {
+    fetchOffer();
+  }, []);
+
+  const fetchOffer = async () => {
+    try {
+      const res = await axios.get(`${API_URL}/public/waitlist/${token}`);
+      setOffer(res.data);
+    } catch {
+      setOffer(null);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleAccept = async () => {
+    setSubmitting(true);
+    try {
+      await axios.post(`${API_URL}/public/waitlist/${token}/accept`);
+      setResult("booked");
+      toast.success("Booking confirmed!");
+    } catch (error: any) {
+      toast.error(error.response?.data?.detail || "This offer is no longer available");
+      setOffer(null);
+    } finally {
+      setSubmitting(false);
+    }
+  };
+
+  const handleDecline = async () => {
+    setSubmitting(true);
+    try {
+      await axios.post(`${API_URL}/public/waitlist/${token}/decline`);
+      setResult("declined");
+    } catch (error: any) {
+      toast.error(error.response?.data?.detail || "This offer is no longer available");
+      setOffer(null);
+    } finally {
+      setSubmitting(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="min-h-screen flex items-center justify-center">
+        <Loader2 className="w-8 h-8 animate-spin text-primary" />
+      </div>
+    );
+  }
+
+  if (result === "booked" && offer) {
+    return (
+      <div className="min-h-screen bg-gray-50 flex items-center justify-center px-4">
+        <Card className="max-w-md w-full text-center shadow-lg">
+          <CardContent className="py-12">
+            <CheckCircle2 className="w-16 h-16 text-green-500 mx-auto mb-4" />
+            <h2 className="text-2xl font-bold mb-2">Booking Confirmed!</h2>
+            <div className="space-y-2 text-sm text-muted-foreground mt-4">
+              <p><strong>Service:</strong> {offer.service_name}</p>
+              <p><strong>Date:</strong> {offer.booking_date}</p>
+              <p><strong>Time:</strong> {offer.start_time} - {offer.end_time}</p>
+            </div>
+            <p className="text-sm text-muted-foreground mt-4">You will receive a confirmation email shortly.</p>
+          </CardContent>
+        </Card>
+      </div>
+    );
+  }
+
+  if (result === "declined") {
+    return (
+      <div className="min-h-screen bg-gray-50 flex items-center justify-center px-4">
+        <Card className="max-w-md w-full text-center shadow-lg">
+          <CardContent className="py-12">
+            <CheckCircle2 className="w-16 h-16 text-muted-foreground mx-auto mb-4" />
+            <h2 className="text-2xl font-bold mb-2">Offer Declined</h2>
+            <p className="text-muted-foreground">We&apos;ve passed the slot on to the next person waiting.</p>
+          </CardContent>
+        </Card>
+      </div>
+    );
+  }
+
+  if (!offer) {
+    return (
+      <div className="min-h-screen bg-gray-50 flex items-center justify-center px-4">
+        <Card className="max-w-md w-full text-center shadow-lg">
+          <CardContent className="py-12">
+            <XCircle className="w-16 h-16 text-muted-foreground mx-auto mb-4" />
+            <h2 className="text-2xl font-bold mb-2">Offer Not Available</h2>
+            <p className="text-muted-foreground">This offer may have expired or already been claimed.</p>
+          </CardContent>
+        </Card>
+      </div>
+    );
+  }
+
+  // The API sends naive UTC timestamps
+  const heldUntil = offer.expires_at
+    ? new Date(`${offer.expires_at}Z`).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" })
+    : null;
+
+  return (
+    <div className="min-h-screen bg-gray-50 py-8 px-4">
+      <div className="max-w-lg mx-auto">
+        <Card className="shadow-lg">
+          <CardHeader className="text-center">
+            <div className="flex justify-center mb-3">
+              <div className="w-12 h-12 gradient-primary rounded-xl flex items-center justify-center">
+                <Zap className="w-7 h-7 text-white" />
+              </div>
+            </div>
+            <CardTitle className="text-2xl">A spot opened up</CardTitle>
+            <CardDescription>{offer.business_name} is holding this slot for you</CardDescription>
+          </CardHeader>
+          <CardContent className="space-y-4">
+            <Card className="bg-muted/50">
+              <CardContent className="p-4">
+                <div className="flex items-center gap-4 text-sm">
+                  <Calendar className="w-5 h-5 text-primary" />
+                  <div>
+                    <p className="font-medium">{offer.service_name}</p>
+                    <p className="text-muted-foreground">{offer.booking_date} at {offer.start_time} - {offer.end_time}</p>
+                  </div>
+                </div>
+              </CardContent>
+            </Card>
+            {heldUntil && (
+              <p className="flex items-center justify-center gap-2 text-sm text-muted-foreground">
+                <Clock className="w-4 h-4" /> Held until {heldUntil}
+              </p>
+            )}
+            <Button onClick={handleAccept} className="w-full h-11 gradient-primary text-white" disabled={submitting}>
+              {submitting ? <Loader2 className="w-4 h-4 animate-spin mr-2" /> : <CheckCircle2 className="w-4 h-4 mr-2" />}
+              {submitting ? "Confirming..." : "Claim this slot"}
+            </Button>
+            <Button onClick={handleDecline} variant="outline" className="w-full h-11" disabled={submitting}>
+              No thanks, pass it on
+            </Button>
+          </CardContent>
+        </Card>
+      </div>
+    </div>
+  );
+}
@@ -149,6 +149,7 @@ export interface User {
     description: string | null;
     fields: FormField[];
     linked_service_ids: string[] | null;
+    applies_to_all_services: boolean;
     deadline_hours: number | null;
     is_active: boolean;
     created_at: string;